@@ -1,7 +1,9 @@
 """Database setup, migrations, and access layer using SQLite."""
 
+import itertools
 import os
 import sqlite3
+import threading
 from contextlib import contextmanager
 
 from meal_planner.config import DB_DIR, DB_PATH
@@ -73,34 +75,241 @@ CREATE TABLE IF NOT EXISTS meal_log (
     meal_type TEXT NOT NULL CHECK(meal_type IN ('breakfast', 'lunch', 'dinner')),
     servings REAL DEFAULT 1.0,
     logged_at TIMESTAMP NOT NULL,
+    -- Date part of logged_at, computed by SQLite so day filters can use an index
+    log_day DATE GENERATED ALWAYS AS (substr(logged_at, 1, 10)) VIRTUAL,
+    -- Per-serving nutrition copied from recipe_nutrition when the meal is
+    -- logged (NULL if the recipe had none), so totals need no join
+    calories REAL,
+    protein_g REAL,
+    carbs_g REAL,
+    fat_g REAL,
+    fiber_g REAL,
+    sugar_g REAL,
+    sodium_mg REAL,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (recipe_id) REFERENCES recipes(id)
 );
 
+-- Per-user, per-day nutrition totals, kept in step with meal_log by
+-- tracker.log_meal so period summaries sum days instead of meals.
+-- WITHOUT ROWID stores rows in (user_id, day) order, so a period's rows
+-- are one contiguous range of the table itself.
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    user_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    calories REAL NOT NULL DEFAULT 0,
+    protein_g REAL NOT NULL DEFAULT 0,
+    carbs_g REAL NOT NULL DEFAULT 0,
+    fat_g REAL NOT NULL DEFAULT 0,
+    fiber_g REAL NOT NULL DEFAULT 0,
+    sugar_g REAL NOT NULL DEFAULT 0,
+    sodium_mg REAL NOT NULL DEFAULT 0,
+    num_meals INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
 CREATE INDEX IF NOT EXISTS idx_meal_log_user_date ON meal_log(user_id, logged_at);
+CREATE INDEX IF NOT EXISTS idx_meal_log_recipe ON meal_log(recipe_id);
 CREATE INDEX IF NOT EXISTS idx_meal_plans_user_week ON meal_plans(user_id, week_start_date);
 CREATE INDEX IF NOT EXISTS idx_recipe_meal_types ON recipes(meal_types);
 """
 
+REBUILD_ROLLUPS_SQL = """
+INSERT INTO daily_rollups
+    (user_id, day, calories, protein_g, carbs_g, fat_g,
+     fiber_g, sugar_g, sodium_mg, num_meals)
+SELECT user_id, log_day,
+       COALESCE(SUM(calories * servings), 0),
+       COALESCE(SUM(protein_g * servings), 0),
+       COALESCE(SUM(carbs_g * servings), 0),
+       COALESCE(SUM(fat_g * servings), 0),
+       COALESCE(SUM(fiber_g * servings), 0),
+       COALESCE(SUM(sugar_g * servings), 0),
+       COALESCE(SUM(sodium_mg * servings), 0),
+       COUNT(*)
+FROM meal_log
+GROUP BY user_id, log_day
+"""
+
+# Nutrition columns meal_log gained after its first release
+_MEAL_LOG_NUTRITION_COLUMNS = (
+    "calories", "protein_g", "carbs_g", "fat_g", "fiber_g", "sugar_g", "sodium_mg"
+)
+
+
+# Applied to every new connection. WAL lets the app's readers run while a
+# meal is being logged, and with WAL synchronous=NORMAL only fsyncs at
+# checkpoints instead of on every commit. In-memory databases keep their
+# "memory" journal mode.
+CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA mmap_size = 134217728;
+PRAGMA cache_size = -20000;
+"""
+
 
 def init_db(db_path: str = DB_PATH) -> None:
     """Initialize the database, creating tables if they don't exist."""
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    if not _is_uri(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
     with get_connection(db_path) as conn:
+        had_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_rollups'"
+        ).fetchone() is not None
         conn.executescript(SCHEMA_SQL)
+    # executescript() commits on its own, so the migrations get a
+    # transaction of their own: an interrupted backfill rolls back whole
+    with get_connection(db_path) as conn:
+        migrated = _migrate_meal_log(conn)
+        # Only a new or upgraded database needs the full scans below; init_db
+        # runs on every CLI command and app start, so skip them otherwise
+        if migrated or not had_rollups:
+            _rebuild_daily_rollups(conn)
+            # Refresh planner statistics so the indexes above get picked
+            conn.execute("ANALYZE")
+
+
+_LOG_DAY_COLUMN = "log_day DATE GENERATED ALWAYS AS (substr(logged_at, 1, 10)) VIRTUAL"
+
+
+def _migrate_meal_log(conn: sqlite3.Connection) -> bool:
+    """Add and backfill meal_log columns missing from older databases.
+
+    Returns:
+        True if any column was added
+    """
+    # table_xinfo, unlike table_info, also lists generated columns
+    columns = {row["name"] for row in conn.execute("PRAGMA table_xinfo(meal_log)")}
+    migrated = False
+    if "log_day" not in columns:
+        conn.execute(f"ALTER TABLE meal_log ADD COLUMN {_LOG_DAY_COLUMN}")
+        migrated = True
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_meal_log_user_day ON meal_log(user_id, log_day)"
+    )
+
+    if "calories" not in columns:
+        for column in _MEAL_LOG_NUTRITION_COLUMNS:
+            conn.execute(f"ALTER TABLE meal_log ADD COLUMN {column} REAL")
+        names = ", ".join(_MEAL_LOG_NUTRITION_COLUMNS)
+        conn.execute(
+            f"""UPDATE meal_log SET ({names}) = (
+                    SELECT {names} FROM recipe_nutrition
+                    WHERE recipe_nutrition.recipe_id = meal_log.recipe_id)"""
+        )
+        migrated = True
+
+    return migrated
+
+
+def _rebuild_daily_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute every daily_rollups row from meal_log.
+
+    Needed when the rollup table is new (databases from before it existed
+    already have logs) or meal_log's nutrition columns were just backfilled.
+    """
+    conn.execute("DELETE FROM daily_rollups")
+    conn.execute(REBUILD_ROLLUPS_SQL)
+
+
+def _is_uri(db_path: str) -> bool:
+    """True for SQLite URI filenames such as "file:x?mode=memory&cache=shared"."""
+    return db_path.startswith("file:")
+
+
+# Per-path counter of writes made through get_connection (and of connection
+# opens, which restart PRAGMA data_version). Values come from one shared
+# counter, so each bump is fresh even across threads.
+_write_counter = itertools.count(1)
+_write_versions: dict = {}
+
+
+def write_version(db_path: str = DB_PATH) -> tuple:
+    """Return a marker for db_path that changes after every committed write.
+
+    Pairs this process's own write counter with PRAGMA data_version,
+    which changes when any other connection (e.g. another process)
+    commits, so results cached under the marker are never stale.
+    """
+    conn, lock = _shared_connection(db_path)
+    with lock:
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return _write_versions.get(db_path, 0), data_version
+
+
+# One connection per database path, shared by all threads. Each comes with
+# a reentrant lock that a get_connection block holds for its whole
+# transaction, so threads take turns and nested blocks on one thread join in.
+_connections: dict = {}
+_connections_lock = threading.Lock()
+
+
+def _shared_connection(db_path: str) -> tuple:
+    """Return (connection, lock) for db_path, opening it on first use.
+
+    Autocommit mode (isolation_level=None): get_connection issues
+    BEGIN/COMMIT itself.
+    """
+    with _connections_lock:
+        entry = _connections.get(db_path)
+        if entry is None:
+            conn = sqlite3.connect(
+                db_path, uri=_is_uri(db_path), isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(CONNECTION_PRAGMAS)
+            entry = _connections[db_path] = (conn, threading.RLock())
+            _write_versions[db_path] = next(_write_counter)
+        return entry
 
 
 @contextmanager
 def get_connection(db_path: str = DB_PATH):
-    """Context manager for database connections."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+    """Context manager for a transaction on the shared database connection.
+
+    Each path has one connection, opened on first use and reused by every
+    thread; the block holds that connection's lock throughout. It runs in
+    one transaction: committed on success, rolled back on error. A nested
+    get_connection on the same path joins the outer transaction.
+
+    db_path may be a file path or a SQLite "file:" URI (e.g. a shared
+    in-memory database for tests).
+    """
+    conn, lock = _shared_connection(db_path)
+    with lock:
+        if conn.in_transaction:
+            yield conn
+            return
+
+        changes = conn.total_changes
+        conn.execute("BEGIN")
+        try:
+            yield conn
+            # executescript() commits on its own, so there may be nothing left
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            if conn.total_changes != changes:
+                _write_versions[db_path] = next(_write_counter)
+
+
+def close_connections() -> None:
+    """Close every shared connection, e.g. before deleting a database file.
+
+    Waits for any block still using a connection to finish.
+    """
+    with _connections_lock:
+        entries = list(_connections.values())
+        _connections.clear()
+    for conn, lock in entries:
+        with lock:
+            conn.close()
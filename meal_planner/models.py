@@ -1,11 +1,18 @@
 """Data models for the meal planning application."""
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date, datetime
+from functools import cached_property
 from typing import Optional
 
+# __slots__ for the value types built on every summary call. dataclass()
+# takes slots= from 3.10, but frozen slotted instances only unpickle (as
+# st.cache_data does with cached results) from 3.11.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 11) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Nutrition:
     """Nutritional information per serving."""
     calories: float
@@ -80,6 +87,15 @@ class Recipe:
     nutrition: Optional[Nutrition] = None  # Per serving
     created_at: Optional[datetime] = None
 
+    @cached_property
+    def meal_types_display(self) -> str:
+        """Capitalized, comma-separated meal types, e.g. "Lunch, Dinner".
+
+        Computed on first access; meal_types is not expected to change
+        after a recipe is loaded.
+        """
+        return ", ".join(mt.capitalize() for mt in self.meal_types)
+
 
 @dataclass
 class UserProfile:
@@ -141,7 +157,7 @@ class MealLog:
     recipe: Optional[Recipe] = None  # Populated on load
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NutritionSummary:
     """Aggregated nutrition for a time period."""
     period_label: str
@@ -79,24 +79,55 @@ def generate_weekly_plan(
     return plan
 
 
+def _insert_meal_plan(conn, plan: MealPlan) -> int:
+    """Insert a plan and its entries using an open connection. Returns the plan ID."""
+    cursor = conn.execute(
+        "INSERT INTO meal_plans (user_id, week_start_date) VALUES (?, ?)",
+        (plan.user_id, plan.week_start_date.isoformat()),
+    )
+    plan_id = cursor.lastrowid
+
+    for entry in plan.entries:
+        conn.execute(
+            """INSERT INTO meal_plan_entries
+               (meal_plan_id, day_of_week, meal_type, recipe_id, servings)
+               VALUES (?, ?, ?, ?, ?)""",
+            (plan_id, entry.day_of_week, entry.meal_type, entry.recipe_id, entry.servings),
+        )
+
+    return plan_id
+
+
 def save_meal_plan(plan: MealPlan, db_path: str = DB_PATH) -> int:
     """Persist a meal plan to the database. Returns the plan ID."""
     with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            "INSERT INTO meal_plans (user_id, week_start_date) VALUES (?, ?)",
-            (plan.user_id, plan.week_start_date.isoformat()),
-        )
-        plan_id = cursor.lastrowid
+        return _insert_meal_plan(conn, plan)
+
+
+def replace_meal_plan(
+    user_id: int,
+    week_start: date,
+    targets: MacroTargets,
+    db_path: str = DB_PATH,
+) -> MealPlan:
+    """Generate a new plan for a week and swap it in for any existing one.
 
+    The old plan (and, via ON DELETE CASCADE, its entries) is deleted and
+    the new one inserted in a single transaction, so the week never ends
+    up with zero or duplicate plans.
+    """
+    plan = generate_weekly_plan(user_id, targets, week_start, db_path)
+
+    with get_connection(db_path) as conn:
+        conn.execute(
+            "DELETE FROM meal_plans WHERE user_id = ? AND week_start_date = ?",
+            (user_id, week_start.isoformat()),
+        )
+        plan.id = _insert_meal_plan(conn, plan)
         for entry in plan.entries:
-            conn.execute(
-                """INSERT INTO meal_plan_entries
-                   (meal_plan_id, day_of_week, meal_type, recipe_id, servings)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (plan_id, entry.day_of_week, entry.meal_type, entry.recipe_id, entry.servings),
-            )
+            entry.meal_plan_id = plan.id
 
-        return plan_id
+    return plan
 
 
 def load_meal_plan(
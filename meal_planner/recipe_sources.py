@@ -8,15 +8,18 @@ Available sources:
 """
 
 import csv
+import io
 import json
 import os
 import time
-from typing import Optional
+from typing import Optional, TextIO
 from urllib.request import urlopen
 
 from meal_planner.config import SEED_DATA_PATH
 from meal_planner.models import Recipe, Nutrition, Ingredient
-from meal_planner.recipe_store import get_all_recipes, save_recipe, recipe_count, search_recipes
+from meal_planner.recipe_store import (
+    get_all_recipes, save_recipe, save_recipes, recipe_count, search_recipes
+)
 
 
 def load_seed_recipes(seed_path: str = SEED_DATA_PATH) -> list:
@@ -74,12 +77,7 @@ def import_seed_recipes(db_path: Optional[str] = None) -> int:
     if recipe_count(**kwargs) > 0:
         return 0  # Already seeded
 
-    recipes = load_seed_recipes()
-    count = 0
-    for recipe in recipes:
-        save_recipe(recipe, **kwargs)
-        count += 1
-    return count
+    return len(save_recipes(load_seed_recipes(), **kwargs))
 
 
 def _discover_nyt_recipe_urls(article_url: str) -> set:
@@ -249,6 +247,37 @@ CSV_COLUMNS = [
 ]
 
 
+def _write_recipes_csv(f: TextIO, recipes: list) -> None:
+    """Write recipes as CSV rows (with header) to an open text stream."""
+    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+
+    for r in recipes:
+        row = {
+            "title": r.title,
+            "source": r.source,
+            "source_url": r.source_url,
+            "servings": r.servings,
+            "prep_time_minutes": r.prep_time_minutes,
+            "cook_time_minutes": r.cook_time_minutes,
+            "meal_types": ",".join(r.meal_types),
+            "cuisine": r.cuisine,
+            "ingredients": json.dumps([
+                {"name": i.name, "quantity": i.quantity, "unit": i.unit, "notes": i.notes}
+                for i in r.ingredients
+            ]),
+            "instructions": json.dumps(r.instructions),
+            "calories": r.nutrition.calories if r.nutrition else "",
+            "protein_g": r.nutrition.protein_g if r.nutrition else "",
+            "carbs_g": r.nutrition.carbs_g if r.nutrition else "",
+            "fat_g": r.nutrition.fat_g if r.nutrition else "",
+            "fiber_g": r.nutrition.fiber_g if r.nutrition else "",
+            "sugar_g": r.nutrition.sugar_g if r.nutrition else "",
+            "sodium_mg": r.nutrition.sodium_mg if r.nutrition else "",
+        }
+        writer.writerow(row)
+
+
 def export_recipes_csv(file_path: str, db_path: Optional[str] = None) -> int:
     """Export all recipes from the database to a CSV file.
 
@@ -258,116 +287,111 @@ def export_recipes_csv(file_path: str, db_path: Optional[str] = None) -> int:
     recipes = get_all_recipes(**kwargs)
 
     with open(file_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
-        writer.writeheader()
-
-        for r in recipes:
-            row = {
-                "title": r.title,
-                "source": r.source,
-                "source_url": r.source_url,
-                "servings": r.servings,
-                "prep_time_minutes": r.prep_time_minutes,
-                "cook_time_minutes": r.cook_time_minutes,
-                "meal_types": ",".join(r.meal_types),
-                "cuisine": r.cuisine,
-                "ingredients": json.dumps([
-                    {"name": i.name, "quantity": i.quantity, "unit": i.unit, "notes": i.notes}
-                    for i in r.ingredients
-                ]),
-                "instructions": json.dumps(r.instructions),
-                "calories": r.nutrition.calories if r.nutrition else "",
-                "protein_g": r.nutrition.protein_g if r.nutrition else "",
-                "carbs_g": r.nutrition.carbs_g if r.nutrition else "",
-                "fat_g": r.nutrition.fat_g if r.nutrition else "",
-                "fiber_g": r.nutrition.fiber_g if r.nutrition else "",
-                "sugar_g": r.nutrition.sugar_g if r.nutrition else "",
-                "sodium_mg": r.nutrition.sodium_mg if r.nutrition else "",
-            }
-            writer.writerow(row)
+        _write_recipes_csv(f, recipes)
 
     return len(recipes)
 
 
+def export_recipes_csv_bytes(db_path: Optional[str] = None) -> bytes:
+    """Export all recipes as UTF-8 encoded CSV, built in memory.
+
+    Same format as export_recipes_csv; suitable for a download button.
+    """
+    kwargs = {"db_path": db_path} if db_path else {}
+    buf = io.StringIO(newline="")
+    _write_recipes_csv(buf, get_all_recipes(**kwargs))
+    return buf.getvalue().encode("utf-8")
+
+
 def import_recipes_csv(file_path: str, db_path: Optional[str] = None) -> int:
     """Import recipes from a CSV file into the database.
 
     Skips recipes whose title already exists in the database.
     Returns the number of newly imported recipes.
     """
+    with open(file_path, "r", newline="", encoding="utf-8") as f:
+        return import_recipes_csv_buffer(f, db_path)
+
+
+def import_recipes_csv_buffer(buf: TextIO, db_path: Optional[str] = None) -> int:
+    """Import recipes from an open CSV text stream (e.g. io.StringIO).
+
+    Same format and duplicate handling as import_recipes_csv, without
+    going through a file on disk.
+    Returns the number of newly imported recipes.
+    """
     kwargs = {"db_path": db_path} if db_path else {}
 
-    with open(file_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        imported = 0
-
-        for row in reader:
-            title = row.get("title", "").strip()
-            if not title:
-                continue
-
-            # Skip duplicates
-            existing = search_recipes(title, **kwargs)
-            if any(r.title.lower() == title.lower() for r in existing):
-                continue
-
-            # Parse nutrition
-            nutrition = None
-            cal = row.get("calories", "").strip()
-            if cal:
-                nutrition = Nutrition(
-                    calories=float(cal),
-                    protein_g=float(row.get("protein_g", 0) or 0),
-                    carbs_g=float(row.get("carbs_g", 0) or 0),
-                    fat_g=float(row.get("fat_g", 0) or 0),
-                    fiber_g=float(row.get("fiber_g", 0) or 0),
-                    sugar_g=float(row.get("sugar_g", 0) or 0),
-                    sodium_mg=float(row.get("sodium_mg", 0) or 0),
-                )
-
-            # Parse ingredients (JSON string or empty)
-            ingredients = []
-            ing_raw = row.get("ingredients", "").strip()
-            if ing_raw:
-                try:
-                    for ing in json.loads(ing_raw):
-                        ingredients.append(Ingredient(
-                            name=ing.get("name", ""),
-                            quantity=ing.get("quantity", 0),
-                            unit=ing.get("unit", ""),
-                            notes=ing.get("notes", ""),
-                        ))
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            # Parse instructions (JSON string or empty)
-            instructions = []
-            inst_raw = row.get("instructions", "").strip()
-            if inst_raw:
-                try:
-                    instructions = json.loads(inst_raw)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-            meal_types = [m.strip() for m in row.get("meal_types", "").split(",") if m.strip()]
-
-            recipe = Recipe(
-                id=None,
-                title=title,
-                source=row.get("source", "csv"),
-                source_url=row.get("source_url", ""),
-                servings=int(row.get("servings", 1) or 1),
-                prep_time_minutes=int(row.get("prep_time_minutes", 0) or 0),
-                cook_time_minutes=int(row.get("cook_time_minutes", 0) or 0),
-                meal_types=meal_types,
-                cuisine=row.get("cuisine", ""),
-                ingredients=ingredients,
-                instructions=instructions,
-                nutrition=nutrition,
+    reader = csv.DictReader(buf)
+    imported = 0
+
+    for row in reader:
+        title = row.get("title", "").strip()
+        if not title:
+            continue
+
+        # Skip duplicates
+        existing = search_recipes(title, **kwargs)
+        if any(r.title.lower() == title.lower() for r in existing):
+            continue
+
+        # Parse nutrition
+        nutrition = None
+        cal = row.get("calories", "").strip()
+        if cal:
+            nutrition = Nutrition(
+                calories=float(cal),
+                protein_g=float(row.get("protein_g", 0) or 0),
+                carbs_g=float(row.get("carbs_g", 0) or 0),
+                fat_g=float(row.get("fat_g", 0) or 0),
+                fiber_g=float(row.get("fiber_g", 0) or 0),
+                sugar_g=float(row.get("sugar_g", 0) or 0),
+                sodium_mg=float(row.get("sodium_mg", 0) or 0),
             )
 
-            save_recipe(recipe, **kwargs)
-            imported += 1
+        # Parse ingredients (JSON string or empty)
+        ingredients = []
+        ing_raw = row.get("ingredients", "").strip()
+        if ing_raw:
+            try:
+                for ing in json.loads(ing_raw):
+                    ingredients.append(Ingredient(
+                        name=ing.get("name", ""),
+                        quantity=ing.get("quantity", 0),
+                        unit=ing.get("unit", ""),
+                        notes=ing.get("notes", ""),
+                    ))
+            except (json.JSONDecodeError, TypeError):
+                pass
+
+        # Parse instructions (JSON string or empty)
+        instructions = []
+        inst_raw = row.get("instructions", "").strip()
+        if inst_raw:
+            try:
+                instructions = json.loads(inst_raw)
+            except (json.JSONDecodeError, TypeError):
+                pass
+
+        meal_types = [m.strip() for m in row.get("meal_types", "").split(",") if m.strip()]
+
+        recipe = Recipe(
+            id=None,
+            title=title,
+            source=row.get("source", "csv"),
+            source_url=row.get("source_url", ""),
+            servings=int(row.get("servings", 1) or 1),
+            prep_time_minutes=int(row.get("prep_time_minutes", 0) or 0),
+            cook_time_minutes=int(row.get("cook_time_minutes", 0) or 0),
+            meal_types=meal_types,
+            cuisine=row.get("cuisine", ""),
+            ingredients=ingredients,
+            instructions=instructions,
+            nutrition=nutrition,
+        )
+
+        save_recipe(recipe, **kwargs)
+        imported += 1
 
     return imported
 
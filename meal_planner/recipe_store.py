@@ -6,6 +6,14 @@ from typing import Optional
 from meal_planner.db import get_connection, DB_PATH
 from meal_planner.models import Recipe, Nutrition, Ingredient
 
+# Recipes LEFT JOINed to their nutrition row, so loading N recipes is a
+# single query instead of one nutrition lookup per recipe.
+_RECIPE_SELECT = """SELECT r.*, rn.recipe_id AS nutrition_recipe_id,
+       rn.calories, rn.protein_g, rn.carbs_g, rn.fat_g,
+       rn.fiber_g, rn.sugar_g, rn.sodium_mg
+FROM recipes r
+LEFT JOIN recipe_nutrition rn ON rn.recipe_id = r.id"""
+
 
 def _row_to_recipe(row, nutrition_row=None) -> Recipe:
     """Convert a database row to a Recipe object."""
@@ -52,14 +60,45 @@ def _row_to_recipe(row, nutrition_row=None) -> Recipe:
     )
 
 
+def _joined_rows_to_recipes(rows) -> list:
+    """Convert rows selected with _RECIPE_SELECT to Recipe objects."""
+    return [
+        _row_to_recipe(row, row if row["nutrition_recipe_id"] is not None else None)
+        for row in rows
+    ]
+
+
 def save_recipe(recipe: Recipe, db_path: str = DB_PATH) -> int:
     """Save a recipe to the database. Returns the recipe ID."""
+    return save_recipes([recipe], db_path)[0]
+
+
+_INSERT_RECIPE_SQL = """INSERT INTO recipes (title, source, source_url, servings,
+                        prep_time_minutes, cook_time_minutes, meal_types, cuisine,
+                        ingredients, instructions)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_INSERT_NUTRITION_SQL = """INSERT INTO recipe_nutrition
+                           (recipe_id, calories, protein_g, carbs_g, fat_g,
+                            fiber_g, sugar_g, sodium_mg)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def save_recipes(recipes: list, db_path: str = DB_PATH) -> list:
+    """Save several recipes in one transaction.
+
+    The recipes and recipe_nutrition inserts each run as a single
+    executemany.
+
+    Returns:
+        Recipe IDs, in the order of recipes
+    """
+    recipes = list(recipes)
+    if not recipes:
+        return []
+
     with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            """INSERT INTO recipes (title, source, source_url, servings,
-               prep_time_minutes, cook_time_minutes, meal_types, cuisine,
-               ingredients, instructions)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        conn.executemany(_INSERT_RECIPE_SQL, [
             (
                 recipe.title,
                 recipe.source,
@@ -74,79 +113,58 @@ def save_recipe(recipe: Recipe, db_path: str = DB_PATH) -> int:
                     for i in recipe.ingredients
                 ]),
                 json.dumps(recipe.instructions),
-            ),
-        )
-        recipe_id = cursor.lastrowid
-
-        if recipe.nutrition:
-            n = recipe.nutrition
-            conn.execute(
-                """INSERT INTO recipe_nutrition
-                   (recipe_id, calories, protein_g, carbs_g, fat_g, fiber_g, sugar_g, sodium_mg)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                (recipe_id, n.calories, n.protein_g, n.carbs_g, n.fat_g,
-                 n.fiber_g, n.sugar_g, n.sodium_mg),
             )
+            for recipe in recipes
+        ])
+        # Same trick as tracker.log_meals: the transaction holds the write
+        # lock, so our IDs are the last len(recipes) AUTOINCREMENT values
+        last_id = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'recipes'"
+        ).fetchone()[0]
+        recipe_ids = list(range(last_id - len(recipes) + 1, last_id + 1))
+
+        conn.executemany(_INSERT_NUTRITION_SQL, [
+            (recipe_id, n.calories, n.protein_g, n.carbs_g, n.fat_g,
+             n.fiber_g, n.sugar_g, n.sodium_mg)
+            for recipe_id, n in zip(recipe_ids, (r.nutrition for r in recipes))
+            if n
+        ])
 
-        return recipe_id
+    return recipe_ids
 
 
 def get_recipe(recipe_id: int, db_path: str = DB_PATH) -> Optional[Recipe]:
     """Load a single recipe by ID."""
     with get_connection(db_path) as conn:
-        row = conn.execute("SELECT * FROM recipes WHERE id = ?", (recipe_id,)).fetchone()
-        if not row:
-            return None
-        nutr_row = conn.execute(
-            "SELECT * FROM recipe_nutrition WHERE recipe_id = ?", (recipe_id,)
-        ).fetchone()
-        return _row_to_recipe(row, nutr_row)
+        rows = conn.execute(f"{_RECIPE_SELECT} WHERE r.id = ?", (recipe_id,)).fetchall()
+        recipes = _joined_rows_to_recipes(rows)
+        return recipes[0] if recipes else None
 
 
 def get_all_recipes(db_path: str = DB_PATH) -> list:
     """Load all recipes with nutrition data."""
     with get_connection(db_path) as conn:
-        rows = conn.execute("SELECT * FROM recipes ORDER BY title").fetchall()
-        recipes = []
-        for row in rows:
-            nutr_row = conn.execute(
-                "SELECT * FROM recipe_nutrition WHERE recipe_id = ?", (row["id"],)
-            ).fetchone()
-            recipes.append(_row_to_recipe(row, nutr_row))
-        return recipes
+        rows = conn.execute(f"{_RECIPE_SELECT} ORDER BY r.title").fetchall()
+        return _joined_rows_to_recipes(rows)
 
 
 def get_recipes_by_meal_type(meal_type: str, db_path: str = DB_PATH) -> list:
     """Get recipes that match a given meal type."""
     with get_connection(db_path) as conn:
         rows = conn.execute(
-            "SELECT * FROM recipes WHERE meal_types LIKE ? ORDER BY title",
+            f"{_RECIPE_SELECT} WHERE r.meal_types LIKE ? ORDER BY r.title",
             (f"%{meal_type}%",),
         ).fetchall()
-        recipes = []
-        for row in rows:
-            nutr_row = conn.execute(
-                "SELECT * FROM recipe_nutrition WHERE recipe_id = ?", (row["id"],)
-            ).fetchone()
-            recipes.append(_row_to_recipe(row, nutr_row))
-        return recipes
+        return _joined_rows_to_recipes(rows)
 
 
 def get_recipes_with_nutrition(db_path: str = DB_PATH) -> list:
     """Get all recipes that have nutrition data."""
     with get_connection(db_path) as conn:
         rows = conn.execute(
-            """SELECT r.* FROM recipes r
-               INNER JOIN recipe_nutrition rn ON r.id = rn.recipe_id
-               ORDER BY r.title""",
+            f"{_RECIPE_SELECT} WHERE rn.recipe_id IS NOT NULL ORDER BY r.title",
         ).fetchall()
-        recipes = []
-        for row in rows:
-            nutr_row = conn.execute(
-                "SELECT * FROM recipe_nutrition WHERE recipe_id = ?", (row["id"],)
-            ).fetchone()
-            recipes.append(_row_to_recipe(row, nutr_row))
-        return recipes
+        return _joined_rows_to_recipes(rows)
 
 
 def recipe_count(db_path: str = DB_PATH) -> int:
@@ -167,13 +185,7 @@ def search_recipes(query: str, db_path: str = DB_PATH) -> list:
     """Search recipes by title (case-insensitive)."""
     with get_connection(db_path) as conn:
         rows = conn.execute(
-            "SELECT * FROM recipes WHERE LOWER(title) LIKE ? ORDER BY title",
+            f"{_RECIPE_SELECT} WHERE LOWER(r.title) LIKE ? ORDER BY r.title",
             (f"%{query.lower()}%",),
         ).fetchall()
-        recipes = []
-        for row in rows:
-            nutr_row = conn.execute(
-                "SELECT * FROM recipe_nutrition WHERE recipe_id = ?", (row["id"],)
-            ).fetchone()
-            recipes.append(_row_to_recipe(row, nutr_row))
-        return recipes
+        return _joined_rows_to_recipes(rows)
@@ -4,10 +4,12 @@ Tracks consumed meals and provides aggregated nutritional data at
 multiple time granularities: daily, weekly, monthly, yearly.
 """
 
+import calendar
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
-from meal_planner.db import get_connection, DB_PATH
+from meal_planner.db import get_connection, write_version, DB_PATH
 from meal_planner.models import MacroTargets, MealLog, Nutrition, NutritionSummary
 from meal_planner.recipe_store import get_recipe
 
@@ -24,13 +26,105 @@ def log_meal(
     if logged_at is None:
         logged_at = datetime.now()
 
+    return log_meals(user_id, [(recipe_id, meal_type, servings, logged_at)], db_path)[0]
+
+
+_INSERT_LOG_SQL = """INSERT INTO meal_log
+                         (user_id, recipe_id, meal_type, servings, logged_at,
+                          calories, protein_g, carbs_g, fat_g, fiber_g, sugar_g, sodium_mg)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# Adds one logged meal to its day's row in daily_rollups
+_UPSERT_ROLLUP_SQL = """INSERT INTO daily_rollups
+                            (user_id, day, calories, protein_g, carbs_g, fat_g,
+                             fiber_g, sugar_g, sodium_mg, num_meals)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                        ON CONFLICT(user_id, day) DO UPDATE SET
+                            calories = calories + excluded.calories,
+                            protein_g = protein_g + excluded.protein_g,
+                            carbs_g = carbs_g + excluded.carbs_g,
+                            fat_g = fat_g + excluded.fat_g,
+                            fiber_g = fiber_g + excluded.fiber_g,
+                            sugar_g = sugar_g + excluded.sugar_g,
+                            sodium_mg = sodium_mg + excluded.sodium_mg,
+                            num_meals = num_meals + 1"""
+
+
+def log_meals(user_id: int, entries: list, db_path: str = DB_PATH) -> list:
+    """Log several consumed meals in one transaction.
+
+    The meal_log inserts and the daily_rollups updates each run as a
+    single executemany.
+
+    Args:
+        user_id: User who ate the meals
+        entries: (recipe_id, meal_type, servings, logged_at) tuples
+        db_path: Database path
+
+    Returns:
+        Log entry IDs, in the order of entries
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+
     with get_connection(db_path) as conn:
-        cursor = conn.execute(
-            """INSERT INTO meal_log (user_id, recipe_id, meal_type, servings, logged_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (user_id, recipe_id, meal_type, servings, logged_at.isoformat()),
-        )
-        return cursor.lastrowid
+        recipe_ids = sorted({entry[0] for entry in entries})
+        nutrition = {
+            row["recipe_id"]: _row_to_nutrition(row)
+            for row in conn.execute(
+                f"""SELECT * FROM recipe_nutrition
+                    WHERE recipe_id IN ({",".join("?" * len(recipe_ids))})""",
+                recipe_ids,
+            )
+        }
+
+        conn.executemany(_INSERT_LOG_SQL, [
+            (user_id, recipe_id, meal_type, servings, logged_at.isoformat(),
+             *_nutrition_values(nutrition.get(recipe_id)))
+            for recipe_id, meal_type, servings, logged_at in entries
+        ])
+        # executemany doesn't report row IDs. The transaction has held the
+        # write lock since the first insert, so ours are the last len(entries)
+        # values handed out by meal_log's AUTOINCREMENT counter.
+        last_id = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'meal_log'"
+        ).fetchone()[0]
+
+        conn.executemany(_UPSERT_ROLLUP_SQL, [
+            _rollup_params(user_id, logged_at.date(), nutrition.get(recipe_id), servings)
+            for recipe_id, _, servings, logged_at in entries
+        ])
+
+    return list(range(last_id - len(entries) + 1, last_id + 1))
+
+
+def _nutrition_values(nutrition: Optional[Nutrition]) -> tuple:
+    """meal_log's per-serving nutrition columns; all NULL without nutrition."""
+    if nutrition is None:
+        return (None,) * 7
+    return (nutrition.calories, nutrition.protein_g, nutrition.carbs_g, nutrition.fat_g,
+            nutrition.fiber_g, nutrition.sugar_g, nutrition.sodium_mg)
+
+
+def _rollup_params(user_id: int, day: date, nutrition: Optional[Nutrition], servings: float) -> tuple:
+    """Parameters for _UPSERT_ROLLUP_SQL for one logged meal.
+
+    Logs of recipes without nutrition still count toward num_meals.
+    """
+    n = nutrition.scaled(servings) if nutrition else Nutrition.zero()
+    return (user_id, day.isoformat(), n.calories, n.protein_g, n.carbs_g, n.fat_g,
+            n.fiber_g, n.sugar_g, n.sodium_mg)
+
+
+def _logged_at_bounds(start: date, end: date) -> tuple:
+    """Half-open ISO text bounds covering the days [start, end].
+
+    logged_at holds datetime.isoformat() text, which sorts by time, so
+    "logged_at >= ? AND logged_at < ?" is an index range scan; wrapping
+    the column in date() would force a per-row function call instead.
+    """
+    return start.isoformat(), (end + timedelta(days=1)).isoformat()
 
 
 def get_meal_logs(
@@ -43,9 +137,9 @@ def get_meal_logs(
     with get_connection(db_path) as conn:
         rows = conn.execute(
             """SELECT * FROM meal_log
-               WHERE user_id = ? AND date(logged_at) >= ? AND date(logged_at) <= ?
+               WHERE user_id = ? AND logged_at >= ? AND logged_at < ?
                ORDER BY logged_at""",
-            (user_id, start_date.isoformat(), end_date.isoformat()),
+            (user_id, *_logged_at_bounds(start_date, end_date)),
         ).fetchall()
 
         logs = []
@@ -63,19 +157,51 @@ def get_meal_logs(
         return logs
 
 
-def _aggregate_nutrition(logs: list) -> Nutrition:
-    """Sum up nutrition across all meal logs."""
-    total = Nutrition.zero()
-    for log in logs:
-        if log.recipe and log.recipe.nutrition:
-            total = total + log.recipe.nutrition.scaled(log.servings)
-    return total
+def _row_to_nutrition(row) -> Nutrition:
+    """Build a Nutrition from a row with one column per nutrient."""
+    return Nutrition(
+        calories=row["calories"],
+        protein_g=row["protein_g"],
+        carbs_g=row["carbs_g"],
+        fat_g=row["fat_g"],
+        fiber_g=row["fiber_g"],
+        sugar_g=row["sugar_g"],
+        sodium_mg=row["sodium_mg"],
+    )
+
 
+def _rollup_summary(
+    user_id: int,
+    start: str,
+    end: str,
+    period_label: str,
+    targets: Optional[MacroTargets],
+    db_path: str,
+) -> NutritionSummary:
+    """Summarize the ISO days [start, end] by summing their daily_rollups rows."""
+    with get_connection(db_path) as conn:
+        row = conn.execute(
+            """SELECT COALESCE(SUM(calories), 0) AS calories,
+                      COALESCE(SUM(protein_g), 0) AS protein_g,
+                      COALESCE(SUM(carbs_g), 0) AS carbs_g,
+                      COALESCE(SUM(fat_g), 0) AS fat_g,
+                      COALESCE(SUM(fiber_g), 0) AS fiber_g,
+                      COALESCE(SUM(sugar_g), 0) AS sugar_g,
+                      COALESCE(SUM(sodium_mg), 0) AS sodium_mg,
+                      COALESCE(SUM(num_meals), 0) AS num_meals,
+                      COUNT(*) AS num_days
+               FROM daily_rollups
+               WHERE user_id = ? AND day BETWEEN ? AND ?""",
+            (user_id, start, end),
+        ).fetchone()
 
-def _count_unique_days(logs: list) -> int:
-    """Count unique days in a set of logs."""
-    days = {log.logged_at.date() for log in logs}
-    return len(days)
+    return NutritionSummary(
+        period_label=period_label,
+        total_nutrition=_row_to_nutrition(row),
+        num_meals=row["num_meals"],
+        num_days=row["num_days"],
+        target=targets,
+    )
 
 
 def daily_summary(
@@ -85,16 +211,42 @@ def daily_summary(
     db_path: str = DB_PATH,
 ) -> NutritionSummary:
     """Get nutrition summary for a single day."""
-    logs = get_meal_logs(user_id, target_date, target_date, db_path)
+    total, num_meals = _daily_totals(db_path, write_version(db_path), user_id, target_date)
     return NutritionSummary(
         period_label=target_date.isoformat(),
-        total_nutrition=_aggregate_nutrition(logs),
-        num_meals=len(logs),
-        num_days=1 if logs else 0,
+        total_nutrition=total,
+        num_meals=num_meals,
+        num_days=1 if num_meals else 0,
         target=targets,
     )
 
 
+@lru_cache(maxsize=4096)
+def _daily_totals(db_path: str, version: tuple, user_id: int, day: date) -> tuple:
+    """(total Nutrition, meal count) for one user and day.
+
+    Memoized per write_version, so any committed write, from this process
+    (e.g. log_meal) or another, makes later calls miss and older entries
+    age out of the cache.
+    """
+    with get_connection(db_path) as conn:
+        row = conn.execute(
+            """SELECT COALESCE(SUM(calories * servings), 0) AS calories,
+                      COALESCE(SUM(protein_g * servings), 0) AS protein_g,
+                      COALESCE(SUM(carbs_g * servings), 0) AS carbs_g,
+                      COALESCE(SUM(fat_g * servings), 0) AS fat_g,
+                      COALESCE(SUM(fiber_g * servings), 0) AS fiber_g,
+                      COALESCE(SUM(sugar_g * servings), 0) AS sugar_g,
+                      COALESCE(SUM(sodium_mg * servings), 0) AS sodium_mg,
+                      COUNT(*) AS num_meals
+               FROM meal_log
+               WHERE user_id = ? AND log_day = ?""",
+            (user_id, day.isoformat()),
+        ).fetchone()
+
+    return _row_to_nutrition(row), row["num_meals"]
+
+
 def weekly_summary(
     user_id: int,
     week_start: date,
@@ -103,17 +255,10 @@ def weekly_summary(
 ) -> NutritionSummary:
     """Get nutrition summary for a week (Mon-Sun)."""
     # Adjust to Monday
-    adjusted = week_start - timedelta(days=week_start.weekday())
-    week_end = adjusted + timedelta(days=6)
-    logs = get_meal_logs(user_id, adjusted, week_end, db_path)
-
-    return NutritionSummary(
-        period_label=f"Week of {adjusted.isoformat()}",
-        total_nutrition=_aggregate_nutrition(logs),
-        num_meals=len(logs),
-        num_days=_count_unique_days(logs),
-        target=targets,
-    )
+    monday = week_start.toordinal() - week_start.weekday()
+    start = date.fromordinal(monday).isoformat()
+    end = date.fromordinal(monday + 6).isoformat()
+    return _rollup_summary(user_id, start, end, f"Week of {start}", targets, db_path)
 
 
 def monthly_summary(
@@ -124,19 +269,10 @@ def monthly_summary(
     db_path: str = DB_PATH,
 ) -> NutritionSummary:
     """Get nutrition summary for a month."""
-    start = date(year, month, 1)
-    if month == 12:
-        end = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end = date(year, month + 1, 1) - timedelta(days=1)
-
-    logs = get_meal_logs(user_id, start, end, db_path)
-    return NutritionSummary(
-        period_label=f"{year}-{month:02d}",
-        total_nutrition=_aggregate_nutrition(logs),
-        num_meals=len(logs),
-        num_days=_count_unique_days(logs),
-        target=targets,
+    label = f"{year}-{month:02d}"
+    last_day = calendar.monthrange(year, month)[1]
+    return _rollup_summary(
+        user_id, f"{label}-01", f"{label}-{last_day:02d}", label, targets, db_path
     )
 
 
@@ -147,16 +283,8 @@ def yearly_summary(
     db_path: str = DB_PATH,
 ) -> NutritionSummary:
     """Get nutrition summary for a year."""
-    start = date(year, 1, 1)
-    end = date(year, 12, 31)
-    logs = get_meal_logs(user_id, start, end, db_path)
-
-    return NutritionSummary(
-        period_label=str(year),
-        total_nutrition=_aggregate_nutrition(logs),
-        num_meals=len(logs),
-        num_days=_count_unique_days(logs),
-        target=targets,
+    return _rollup_summary(
+        user_id, f"{year:04d}-01-01", f"{year:04d}-12-31", str(year), targets, db_path
     )
 
 
@@ -3,18 +3,22 @@
 Search, filter, and view recipe details.
 """
 
+import io
 import streamlit as st
 import pandas as pd
-from meal_planner.recipe_store import get_all_recipes, search_recipes, recipe_count
-from meal_planner.recipe_sources import export_recipes_csv, import_recipes_csv
+from meal_planner.db import write_version
+from meal_planner.recipe_sources import import_recipes_csv_buffer
+from pages.components.data_cache import (
+    clear_recipe_caches, load_recipe_rows, load_recipes_csv_bytes
+)
 from pages.components.recipe_card import render_recipe_detail
 
 st.set_page_config(page_title="Recipes | Meal Planner", page_icon="📚", layout="wide")
 st.title("📚 Recipe Browser")
 
-# Load all recipes
-all_recipes = get_all_recipes()
-total_count = len(all_recipes)
+# Load all recipes (cached, with display strings pre-formatted)
+recipe_rows = load_recipe_rows(write_version())
+total_count = len(recipe_rows)
 
 if total_count == 0:
     st.warning("⚠️ No recipes found in the database.")
@@ -23,6 +27,7 @@ if total_count == 0:
     if st.button("📥 Import Seed Recipes"):
         from meal_planner.recipe_sources import import_seed_recipes
         count = import_seed_recipes()
+        clear_recipe_caches()
         st.success(f"✅ Imported {count} seed recipes!")
         st.rerun()
     st.stop()
@@ -58,29 +63,32 @@ with col3:
     )
 
 # Apply filters
-filtered_recipes = all_recipes
+filtered_rows = recipe_rows
 
-# Search filter
+# Search filter (Unicode case-insensitive: titles are casefolded at load time)
 if search_query:
-    filtered_recipes = [
-        r for r in filtered_recipes
-        if search_query.lower() in r.title.lower()
+    query_cf = search_query.casefold()
+    filtered_rows = [
+        row for row in filtered_rows
+        if query_cf in row.title_cf
     ]
 
 # Meal type filter
 if meal_type_filter:
-    filtered_recipes = [
-        r for r in filtered_recipes
-        if any(mt in r.meal_types for mt in meal_type_filter)
+    filtered_rows = [
+        row for row in filtered_rows
+        if any(mt in row.recipe.meal_types for mt in meal_type_filter)
     ]
 
 # Cooking time filter
 if max_time > 0:
-    filtered_recipes = [
-        r for r in filtered_recipes
-        if (r.prep_time_minutes + r.cook_time_minutes) <= max_time
+    filtered_rows = [
+        row for row in filtered_rows
+        if (row.recipe.prep_time_minutes + row.recipe.cook_time_minutes) <= max_time
     ]
 
+filtered_recipes = [row.recipe for row in filtered_rows]
+
 # Display count
 st.caption(f"Showing {len(filtered_recipes)} of {total_count} recipes")
 
@@ -92,23 +100,18 @@ st.markdown("### Recipes")
 if len(filtered_recipes) == 0:
     st.info("No recipes match your filters. Try adjusting your search or filters.")
 else:
-    # Create DataFrame for display
-    recipe_data = []
-    for recipe in filtered_recipes:
-        total_time = recipe.prep_time_minutes + recipe.cook_time_minutes
-        recipe_data.append({
-            "ID": recipe.id,
-            "Title": recipe.title,
-            "Time (min)": total_time if total_time > 0 else "N/A",
-            "Calories": f"{recipe.nutrition.calories:.0f}" if recipe.nutrition else "N/A",
-            "Protein (g)": f"{recipe.nutrition.protein_g:.0f}" if recipe.nutrition else "N/A",
-            "Carbs (g)": f"{recipe.nutrition.carbs_g:.0f}" if recipe.nutrition else "N/A",
-            "Fat (g)": f"{recipe.nutrition.fat_g:.0f}" if recipe.nutrition else "N/A",
-            "Meal Types": ", ".join([mt.capitalize() for mt in recipe.meal_types]),
-            "Source": recipe.source.title()
-        })
-
-    df = pd.DataFrame(recipe_data)
+    # Create DataFrame for display from the pre-formatted rows
+    df = pd.DataFrame({
+        "ID": [row.recipe.id for row in filtered_rows],
+        "Title": [row.recipe.title for row in filtered_rows],
+        "Time (min)": [row.total_time for row in filtered_rows],
+        "Calories": [row.calories for row in filtered_rows],
+        "Protein (g)": [row.protein for row in filtered_rows],
+        "Carbs (g)": [row.carbs for row in filtered_rows],
+        "Fat (g)": [row.fat for row in filtered_rows],
+        "Meal Types": [row.meal_types for row in filtered_rows],
+        "Source": [row.source for row in filtered_rows],
+    })
 
     # Display table
     st.dataframe(
@@ -133,16 +136,17 @@ else:
     # Recipe detail viewer
     st.markdown("### Recipe Details")
 
-    # Recipe selector
-    recipe_options = {f"{r.id} - {r.title}": r for r in filtered_recipes}
-    selected_recipe_key = st.selectbox(
+    # Recipe selector (options are IDs), served from the rows already loaded
+    id_to_recipe = {r.id: r for r in filtered_recipes}
+    selected_recipe_id = st.selectbox(
         "Select a recipe to view details",
-        options=list(recipe_options.keys()),
+        options=list(id_to_recipe),
+        format_func=lambda recipe_id: f"{recipe_id} - {id_to_recipe[recipe_id].title}",
         help="Choose a recipe to see full details"
     )
 
-    if selected_recipe_key:
-        selected_recipe = recipe_options[selected_recipe_key]
+    if selected_recipe_id is not None:
+        selected_recipe = id_to_recipe[selected_recipe_id]
 
         with st.container():
             render_recipe_detail(selected_recipe)
@@ -158,15 +162,16 @@ with col1:
     export_filename = st.text_input(
         "Export filename",
         value="my_recipes.csv",
-        help="File will be saved in the current directory"
+        help="Name of the downloaded file"
     )
 
-    if st.button("📤 Export to CSV", use_container_width=True):
-        try:
-            count = export_recipes_csv(export_filename)
-            st.success(f"✅ Exported {count} recipes to {export_filename}")
-        except Exception as e:
-            st.error(f"❌ Export failed: {e}")
+    st.download_button(
+        label="📤 Download CSV",
+        data=load_recipes_csv_bytes(write_version()),
+        file_name=export_filename,
+        mime="text/csv",
+        use_container_width=True
+    )
 
 with col2:
     st.markdown("#### Import Recipes")
@@ -179,19 +184,10 @@ with col2:
     if import_file is not None:
         if st.button("📥 Import from CSV", use_container_width=True):
             try:
-                # Save uploaded file temporarily
-                import tempfile
-                import os
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-                    tmp_file.write(import_file.getvalue())
-                    tmp_path = tmp_file.name
-
-                # Import recipes
-                count = import_recipes_csv(tmp_path)
-
-                # Clean up temp file
-                os.unlink(tmp_path)
+                # Import straight from the uploaded bytes
+                csv_text = io.StringIO(import_file.getvalue().decode("utf-8"))
+                count = import_recipes_csv_buffer(csv_text)
+                clear_recipe_caches()
 
                 st.success(f"✅ Imported {count} new recipes!")
                 st.info("Refresh the page to see the new recipes.")
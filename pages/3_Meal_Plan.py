@@ -7,11 +7,12 @@ import streamlit as st
 from datetime import date, timedelta
 from meal_planner.planner import (
     generate_weekly_plan, load_meal_plan, save_meal_plan,
-    regenerate_meal, DAY_NAMES
+    regenerate_meal, replace_meal_plan, DAY_NAMES
 )
 from meal_planner.models import Nutrition
-from meal_planner.recipe_store import recipe_count
-from pages.components.nutrition_display import render_nutrition_card
+from pages.components.adherence import adherence_levels, adherence_vec
+from pages.components.data_cache import cached_load_meal_plan, cached_recipe_count
+from pages.components.nutrition_display import ADHERENCE_MESSAGES, render_nutrition_card
 
 st.set_page_config(page_title="Meal Plan | Meal Planner", page_icon="📅", layout="wide")
 st.title("📅 Weekly Meal Planner")
@@ -25,7 +26,7 @@ user = st.session_state.user_profile
 targets = st.session_state.macro_targets
 
 # Check if recipes exist
-num_recipes = recipe_count()
+num_recipes = cached_recipe_count()
 if num_recipes == 0:
     st.error("❌ No recipes found. Please add recipes first in the Recipes page.")
     st.stop()
@@ -68,6 +69,127 @@ with col3:
 
 st.divider()
 
+
+@st.dialog("Confirm regenerate?")
+def confirm_regenerate(user_id, week_start, targets):
+    """Confirm, then replace the whole week's plan in one transaction."""
+    st.warning("⚠️ This will replace your entire meal plan.")
+
+    col_ok, col_cancel = st.columns(2)
+    if col_ok.button("Regenerate", type="primary", use_container_width=True):
+        with st.spinner("Generating new meal plan..."):
+            try:
+                replace_meal_plan(user_id, week_start, targets)
+                cached_load_meal_plan.clear()
+            except Exception as e:
+                st.error(f"❌ Failed to regenerate: {e}")
+                return
+        st.rerun()
+    if col_cancel.button("Cancel", use_container_width=True):
+        st.rerun()
+
+
+def swap_meal(plan, day, meal_type, targets):
+    """Swap button callback: regenerate one meal and patch the plan in place."""
+    try:
+        new_entry = regenerate_meal(plan.id, day, meal_type, targets)
+    except Exception as e:
+        st.session_state[f"swap_error_{day}"] = f"❌ Failed to regenerate: {e}"
+        return
+
+    if not new_entry:
+        st.session_state[f"swap_error_{day}"] = "❌ Could not find replacement recipe"
+        return
+
+    cached_load_meal_plan.clear()
+    plan.entries = [
+        new_entry if (e.day_of_week == day and e.meal_type == meal_type) else e
+        for e in plan.entries
+    ]
+
+
+@st.fragment
+def render_day(day, week_start, plan, targets):
+    """Render one day of the plan grid.
+
+    Runs as a fragment so a Swap click only reruns this day.
+    """
+    day_date = week_start + timedelta(days=day)
+    day_entries = [e for e in plan.entries if e.day_of_week == day]
+
+    # Day header
+    st.markdown(f"#### {DAY_NAMES[day]} - {day_date.strftime('%b %d')}")
+
+    swap_error = st.session_state.pop(f"swap_error_{day}", None)
+    if swap_error:
+        st.error(swap_error)
+
+    # Create columns for each meal
+    cols = st.columns([3, 3, 3, 2])
+
+    day_nutrition = Nutrition(calories=0, protein_g=0, carbs_g=0, fat_g=0)
+
+    # Breakfast, Lunch, Dinner
+    for i, meal_type in enumerate(['breakfast', 'lunch', 'dinner']):
+        entry = next((e for e in day_entries if e.meal_type == meal_type), None)
+
+        with cols[i]:
+            st.markdown(f"**{meal_type.capitalize()}**")
+
+            if entry and entry.recipe:
+                recipe = entry.recipe
+                nutrition = recipe.nutrition.scaled(entry.servings) if recipe.nutrition else None
+
+                if nutrition:
+                    day_nutrition = day_nutrition + nutrition
+
+                # Display recipe info
+                with st.container():
+                    st.markdown(f"**{recipe.title}**")
+                    st.caption(f"Servings: {entry.servings:.2g}")
+
+                    if nutrition:
+                        col_a, col_b = st.columns(2)
+                        col_a.metric("Cal", f"{nutrition.calories:.0f}")
+                        col_b.metric("P", f"{nutrition.protein_g:.0f}g")
+
+                        col_c, col_d = st.columns(2)
+                        col_c.metric("C", f"{nutrition.carbs_g:.0f}g")
+                        col_d.metric("F", f"{nutrition.fat_g:.0f}g")
+                    else:
+                        st.caption("_No nutrition data_")
+
+                    # Regenerate button (swaps in a callback before the fragment reruns)
+                    st.button(
+                        "🔄 Swap",
+                        key=f"regen_{day}_{meal_type}",
+                        use_container_width=True,
+                        on_click=swap_meal,
+                        args=(plan, day, meal_type, targets)
+                    )
+            else:
+                st.info("No meal assigned")
+
+    # Daily totals
+    with cols[3]:
+        st.markdown("**Daily Total**")
+        st.metric("Calories", f"{day_nutrition.calories:.0f}")
+        st.caption(f"P: {day_nutrition.protein_g:.0f}g")
+        st.caption(f"C: {day_nutrition.carbs_g:.0f}g")
+        st.caption(f"F: {day_nutrition.fat_g:.0f}g")
+
+        # Adherence indicator
+        cal_pct = (day_nutrition.calories / targets.calories * 100) if targets.calories > 0 else 0
+        if 90 <= cal_pct <= 110:
+            st.success(f"{cal_pct:.0f}% of target")
+        elif 80 <= cal_pct <= 120:
+            st.warning(f"{cal_pct:.0f}% of target")
+        else:
+            st.error(f"{cal_pct:.0f}% of target")
+
+    st.divider()
+
+
 # Load or generate meal plan
 plan = load_meal_plan(user.id, week_start)
 
@@ -80,6 +202,7 @@ if not plan:
                 plan = generate_weekly_plan(user.id, targets, week_start)
                 plan_id = save_meal_plan(plan)
                 plan.id = plan_id
+                cached_load_meal_plan.clear()
                 st.success("✅ Meal plan generated successfully!")
                 st.rerun()
             except Exception as e:
@@ -92,104 +215,30 @@ else:
     st.markdown("### Weekly Meal Plan")
 
     for day in range(7):
-        day_date = week_start + timedelta(days=day)
-        day_entries = [e for e in plan.entries if e.day_of_week == day]
-
-        # Day header
-        st.markdown(f"#### {DAY_NAMES[day]} - {day_date.strftime('%b %d')}")
-
-        # Create columns for each meal
-        cols = st.columns([3, 3, 3, 2])
-
-        day_nutrition = Nutrition(calories=0, protein_g=0, carbs_g=0, fat_g=0)
-
-        # Breakfast, Lunch, Dinner
-        for i, meal_type in enumerate(['breakfast', 'lunch', 'dinner']):
-            entry = next((e for e in day_entries if e.meal_type == meal_type), None)
-
-            with cols[i]:
-                st.markdown(f"**{meal_type.capitalize()}**")
-
-                if entry and entry.recipe:
-                    recipe = entry.recipe
-                    nutrition = recipe.nutrition.scaled(entry.servings) if recipe.nutrition else None
-
-                    if nutrition:
-                        day_nutrition = day_nutrition + nutrition
-
-                    # Display recipe info
-                    with st.container():
-                        st.markdown(f"**{recipe.title}**")
-                        st.caption(f"Servings: {entry.servings:.2g}")
-
-                        if nutrition:
-                            col_a, col_b = st.columns(2)
-                            col_a.metric("Cal", f"{nutrition.calories:.0f}")
-                            col_b.metric("P", f"{nutrition.protein_g:.0f}g")
-
-                            col_c, col_d = st.columns(2)
-                            col_c.metric("C", f"{nutrition.carbs_g:.0f}g")
-                            col_d.metric("F", f"{nutrition.fat_g:.0f}g")
-                        else:
-                            st.caption("_No nutrition data_")
-
-                        # Regenerate button
-                        if st.button(
-                            "🔄 Swap",
-                            key=f"regen_{day}_{meal_type}",
-                            use_container_width=True
-                        ):
-                            with st.spinner("Finding new recipe..."):
-                                try:
-                                    new_entry = regenerate_meal(plan.id, day, meal_type, targets)
-                                    if new_entry:
-                                        st.success("✅ Meal updated!")
-                                        st.rerun()
-                                    else:
-                                        st.error("❌ Could not find replacement recipe")
-                                except Exception as e:
-                                    st.error(f"❌ Failed to regenerate: {e}")
-                else:
-                    st.info("No meal assigned")
-
-        # Daily totals
-        with cols[3]:
-            st.markdown("**Daily Total**")
-            st.metric("Calories", f"{day_nutrition.calories:.0f}")
-            st.caption(f"P: {day_nutrition.protein_g:.0f}g")
-            st.caption(f"C: {day_nutrition.carbs_g:.0f}g")
-            st.caption(f"F: {day_nutrition.fat_g:.0f}g")
-
-            # Adherence indicator
-            cal_pct = (day_nutrition.calories / targets.calories * 100) if targets.calories > 0 else 0
-            if 90 <= cal_pct <= 110:
-                st.success(f"{cal_pct:.0f}% of target")
-            elif 80 <= cal_pct <= 120:
-                st.warning(f"{cal_pct:.0f}% of target")
-            else:
-                st.error(f"{cal_pct:.0f}% of target")
-
-        st.divider()
+        render_day(day, week_start, plan, targets)
 
     # Weekly summary
     st.markdown("### Weekly Summary")
 
     # Calculate weekly totals
-    weekly_nutrition = Nutrition(calories=0, protein_g=0, carbs_g=0, fat_g=0)
+    calories = protein_g = carbs_g = fat_g = 0.0
     meal_count = 0
 
     for entry in plan.entries:
         if entry.recipe and entry.recipe.nutrition:
-            nutrition = entry.recipe.nutrition.scaled(entry.servings)
-            weekly_nutrition = weekly_nutrition + nutrition
+            n, s = entry.recipe.nutrition, entry.servings
+            calories += n.calories * s
+            protein_g += n.protein_g * s
+            carbs_g += n.carbs_g * s
+            fat_g += n.fat_g * s
             meal_count += 1
 
     # Calculate daily average
     daily_avg = Nutrition(
-        calories=weekly_nutrition.calories / 7,
-        protein_g=weekly_nutrition.protein_g / 7,
-        carbs_g=weekly_nutrition.carbs_g / 7,
-        fat_g=weekly_nutrition.fat_g / 7
+        calories=calories / 7,
+        protein_g=protein_g / 7,
+        carbs_g=carbs_g / 7,
+        fat_g=fat_g / 7
     )
 
     col1, col2 = st.columns(2)
@@ -201,20 +250,15 @@ else:
     with col2:
         st.markdown("#### vs Target")
 
-        def adherence_pct(actual, target):
-            if target == 0:
-                return 100
-            return max(0, 100 - abs(actual - target) / target * 100)
+        labels = ["Calories", "Protein", "Carbs", "Fat"]
+        actual_vals = [daily_avg.calories, daily_avg.protein_g, daily_avg.carbs_g, daily_avg.fat_g]
+        target_vals = [targets.calories, targets.protein_g, targets.carbs_g, targets.fat_g]
 
-        metrics = [
-            ("Calories", daily_avg.calories, targets.calories),
-            ("Protein", daily_avg.protein_g, targets.protein_g),
-            ("Carbs", daily_avg.carbs_g, targets.carbs_g),
-            ("Fat", daily_avg.fat_g, targets.fat_g),
-        ]
+        # Adherence % for all four macros at once (100% = perfect match)
+        pcts = adherence_vec(actual_vals, target_vals)
+        levels = adherence_levels(pcts)
 
-        for label, actual, target in metrics:
-            pct = adherence_pct(actual, target)
+        for label, actual, target, pct, level in zip(labels, actual_vals, target_vals, pcts, levels):
             col_a, col_b, col_c = st.columns([2, 2, 1])
 
             with col_a:
@@ -222,31 +266,13 @@ else:
             with col_b:
                 st.caption(f"Target: {target:.0f}")
             with col_c:
-                if pct > 90:
-                    st.success(f"{pct:.0f}%")
-                elif pct > 70:
-                    st.warning(f"{pct:.0f}%")
-                else:
-                    st.error(f"{pct:.0f}%")
+                ADHERENCE_MESSAGES[level](f"{pct:.0f}%")
 
     # Regenerate entire plan button
     st.divider()
 
     if st.button("🔄 Regenerate Entire Plan", type="secondary"):
-        if st.session_state.get('confirm_regenerate'):
-            with st.spinner("Generating new meal plan..."):
-                try:
-                    # Delete old plan and generate new one
-                    new_plan = generate_weekly_plan(user.id, targets, week_start)
-                    plan_id = save_meal_plan(new_plan)
-                    st.success("✅ New meal plan generated!")
-                    st.session_state.confirm_regenerate = False
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Failed to regenerate: {e}")
-        else:
-            st.warning("⚠️ This will replace your entire meal plan. Click again to confirm.")
-            st.session_state.confirm_regenerate = True
+        confirm_regenerate(user.id, week_start, targets)
 
 st.markdown("---")
 st.caption("💡 **Tip:** Use the 'Swap' buttons to replace individual meals, or regenerate the entire week for a fresh plan.")
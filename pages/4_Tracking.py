@@ -4,18 +4,37 @@ Log meals and track nutrition with detailed analytics.
 """
 
 import streamlit as st
+import pandas as pd
 from datetime import date, datetime, timedelta
-from meal_planner.tracker import (
-    log_meal, daily_summary, weekly_summary,
-    monthly_summary, yearly_summary, get_meal_logs
-)
-from meal_planner.recipe_store import get_all_recipes
+from meal_planner.db import write_version
+from meal_planner.tracker import log_meal, get_meal_logs
 from pages.components.nutrition_display import render_nutrition_card, render_target_comparison
 from pages.components.charts import (
     create_daily_calories_trend, create_macro_stacked_bar, create_adherence_gauge
 )
+from pages.components.data_cache import (
+    cached_daily_summary, cached_monthly_summary, cached_weekly_summary,
+    cached_yearly_summary, load_recipe_options, logs_to_daily_df
+)
 
 st.set_page_config(page_title="Tracking | Meal Planner", page_icon="📊", layout="wide")
+
+
+def seed_widget(key, value):
+    """Set the default of the keyed widget `key`, once per calendar day.
+
+    Keyed widgets keep the user's edits across reruns, so defaults only
+    need seeding (again after Streamlit drops the state of a widget that
+    went unrendered, e.g. on another page). Re-seeding when the day changes
+    stops a tab left open overnight from defaulting to yesterday. Call
+    before creating the widget.
+    """
+    today = date.today()
+    if key not in st.session_state or st.session_state.get(f"_{key}_seeded") != today:
+        st.session_state[f"_{key}_seeded"] = today
+        st.session_state[key] = value
+
+
 st.title("📊 Nutrition Tracking & Analytics")
 
 # Check if user profile exists
@@ -31,82 +50,91 @@ st.info(f"👤 Tracking for: **{user.name}** | 🎯 Target: **{targets.calories:
 # Meal Logging Section
 st.markdown("### Log a Meal")
 
-with st.form("log_meal_form"):
-    col1, col2, col3, col4 = st.columns([3, 2, 1, 2])
+# Load recipes for dropdown
+_, recipe_labels, id_to_recipe = load_recipe_options(write_version())
+if len(recipe_labels) == 0:
+    st.error("No recipes found. Add recipes first.")
+    st.stop()
 
-    # Load recipes for dropdown
-    all_recipes = get_all_recipes()
-    recipe_options = {f"{r.id} - {r.title}": r for r in all_recipes}
 
-    with col1:
-        if len(recipe_options) == 0:
-            st.error("No recipes found. Add recipes first.")
-            st.stop()
-
-        selected_recipe_key = st.selectbox(
-            "Recipe",
-            options=list(recipe_options.keys()),
-            help="Select the recipe you consumed"
-        )
+@st.fragment
+def meal_log_fragment(user, recipe_labels, id_to_recipe):
+    """Meal log form.
 
-    with col2:
-        meal_type = st.selectbox(
-            "Meal Type",
-            options=["breakfast", "lunch", "dinner"],
-            help="When did you eat this?"
-        )
+    Runs as a fragment: submitting it does not rerun the analytics tabs.
+    They pick up the new log (via write_version) on their next rerun.
+    """
+    seed_widget("log_date", date.today())
+    seed_widget("log_time", datetime.now().time())
 
-    with col3:
-        servings = st.number_input(
-            "Servings",
-            min_value=0.25,
-            max_value=10.0,
-            value=1.0,
-            step=0.25,
-            help="How many servings?"
-        )
-
-    with col4:
-        log_date = st.date_input(
-            "Date",
-            value=date.today(),
-            help="When did you eat this?"
-        )
-        log_time = st.time_input(
-            "Time",
-            value=datetime.now().time(),
-            help="What time?"
-        )
+    with st.form("log_meal_form"):
+        col1, col2, col3, col4 = st.columns([3, 2, 1, 2])
 
-    submitted = st.form_submit_button("📝 Log Meal", use_container_width=True)
+        with col1:
+            selected_recipe_key = st.selectbox(
+                "Recipe",
+                options=recipe_labels,
+                help="Select the recipe you consumed"
+            )
 
-    if submitted:
-        selected_recipe = recipe_options[selected_recipe_key]
+        with col2:
+            meal_type = st.selectbox(
+                "Meal Type",
+                options=["breakfast", "lunch", "dinner"],
+                help="When did you eat this?"
+            )
 
-        # Combine date and time
-        logged_at = datetime.combine(log_date, log_time)
+        with col3:
+            servings = st.number_input(
+                "Servings",
+                min_value=0.25,
+                max_value=10.0,
+                value=1.0,
+                step=0.25,
+                help="How many servings?"
+            )
 
-        try:
-            log_id = log_meal(
-                user_id=user.id,
-                recipe_id=selected_recipe.id,
-                meal_type=meal_type,
-                servings=servings,
-                logged_at=logged_at
+        with col4:
+            log_date = st.date_input(
+                "Date",
+                key="log_date",
+                help="When did you eat this?"
+            )
+            log_time = st.time_input(
+                "Time",
+                key="log_time",
+                help="What time?"
             )
 
-            # Show confirmation with nutrition info
-            if selected_recipe.nutrition:
-                nutrition = selected_recipe.nutrition.scaled(servings)
-                st.success(f"✅ Logged: {selected_recipe.title} ({nutrition.calories:.0f} cal)")
-            else:
-                st.success(f"✅ Logged: {selected_recipe.title}")
+        submitted = st.form_submit_button("📝 Log Meal", use_container_width=True)
+
+        if submitted:
+            selected_recipe = id_to_recipe[int(selected_recipe_key.split(" - ", 1)[0])]
+
+            # Combine date and time
+            logged_at = datetime.combine(log_date, log_time)
+
+            try:
+                log_id = log_meal(
+                    user_id=user.id,
+                    recipe_id=selected_recipe.id,
+                    meal_type=meal_type,
+                    servings=servings,
+                    logged_at=logged_at
+                )
 
-            # Clear form by rerunning
-            st.rerun()
+                # Show confirmation with nutrition info
+                if selected_recipe.nutrition:
+                    nutrition = selected_recipe.nutrition.scaled(servings)
+                    st.success(f"✅ Logged: {selected_recipe.title} ({nutrition.calories:.0f} cal)")
+                else:
+                    st.success(f"✅ Logged: {selected_recipe.title}")
 
-        except Exception as e:
-            st.error(f"❌ Failed to log meal: {e}")
+            except Exception as e:
+                st.error(f"❌ Failed to log meal: {e}")
+
+
+meal_log_fragment(user, recipe_labels, id_to_recipe)
 
 st.divider()
 
@@ -118,17 +146,21 @@ period_tab1, period_tab2, period_tab3, period_tab4 = st.tabs([
     "📅 Daily", "📆 Weekly", "📊 Monthly", "📈 Yearly"
 ])
 
+
 # Daily Tab
-with period_tab1:
+@st.fragment
+def daily_tab_fragment(user, targets):
+    """Daily tab: one day's totals, adherence and meal list."""
     st.markdown("#### Daily Summary")
 
+    seed_widget("daily_date", date.today())
+
     selected_date = st.date_input(
         "Select date",
-        value=date.today(),
         key="daily_date"
     )
 
-    summary = daily_summary(user.id, selected_date, targets)
+    summary = cached_daily_summary(write_version(), user.id, selected_date)
 
     if summary.num_meals == 0:
         st.info(f"No meals logged for {selected_date.strftime('%B %d, %Y')}")
@@ -141,7 +173,8 @@ with period_tab1:
             render_nutrition_card(
                 summary.total_nutrition,
                 servings=1.0,
-                title="Total Nutrition"
+                title="Total Nutrition",
+                compact=True
             )
 
         with col2:
@@ -150,37 +183,42 @@ with period_tab1:
 
         # Show individual meals
         st.markdown("##### Meals Logged")
-        meal_logs = get_meal_logs(
-            user.id,
-            selected_date,
-            selected_date + timedelta(days=1)
-        )
+        meal_logs = get_meal_logs(user.id, selected_date, selected_date)
 
+        rows = []
         for log in meal_logs:
             if log.recipe:
-                nutrition = log.recipe.nutrition.scaled(log.servings) if log.recipe.nutrition else None
-                with st.expander(
-                    f"{log.meal_type.capitalize()}: {log.recipe.title} "
-                    f"({nutrition.calories:.0f} cal)" if nutrition else log.recipe.title
-                ):
-                    st.caption(f"Time: {log.logged_at.strftime('%I:%M %p')}")
-                    st.caption(f"Servings: {log.servings:.2g}")
-                    if nutrition:
-                        st.caption(f"P: {nutrition.protein_g:.0f}g | C: {nutrition.carbs_g:.0f}g | F: {nutrition.fat_g:.0f}g")
+                n, s = log.recipe.nutrition, log.servings
+                rows.append({
+                    "Meal": log.meal_type.capitalize(),
+                    "Recipe": log.recipe.title,
+                    "Time": log.logged_at.strftime('%I:%M %p'),
+                    "Servings": f"{s:.2g}",
+                    "Calories": round(n.calories * s) if n else None,
+                    "P (g)": round(n.protein_g * s) if n else None,
+                    "C (g)": round(n.carbs_g * s) if n else None,
+                    "F (g)": round(n.fat_g * s) if n else None,
+                })
+
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
 
 # Weekly Tab
-with period_tab2:
+@st.fragment
+def weekly_tab_fragment(user, targets):
+    """Weekly tab: daily averages and trend charts for one week."""
     st.markdown("#### Weekly Summary")
 
+    seed_widget("weekly_date", date.today())
+
     week_date = st.date_input(
         "Select week (any day in the week)",
-        value=date.today(),
         key="weekly_date"
     )
 
     week_start = week_date - timedelta(days=week_date.weekday())
 
-    summary = weekly_summary(user.id, week_start, targets)
+    summary = cached_weekly_summary(write_version(), user.id, week_start)
 
     if summary.num_meals == 0:
         st.info(f"No meals logged for week of {week_start.strftime('%B %d, %Y')}")
@@ -195,7 +233,8 @@ with period_tab2:
             render_nutrition_card(
                 summary.daily_average,
                 servings=1.0,
-                title="Daily Average"
+                title="Daily Average",
+                compact=True
             )
 
         with col2:
@@ -205,39 +244,50 @@ with period_tab2:
         # Charts
         st.markdown("##### Weekly Trends")
 
-        meal_logs = get_meal_logs(
+        daily_df = logs_to_daily_df(
+            write_version(),
             user.id,
             week_start,
-            week_start + timedelta(days=7)
+            week_start + timedelta(days=6)
         )
+        trend_fig = create_daily_calories_trend(daily_df)
+        macro_fig = create_macro_stacked_bar(daily_df, targets)
 
         col_a, col_b = st.columns(2)
 
         with col_a:
-            fig = create_daily_calories_trend(meal_logs)
-            st.plotly_chart(fig, use_container_width=True)
+            if trend_fig is None:
+                st.info("No meal logs found")
+            else:
+                st.plotly_chart(trend_fig, use_container_width=True, key="weekly_trend")
 
         with col_b:
-            fig = create_macro_stacked_bar(meal_logs, targets)
-            st.plotly_chart(fig, use_container_width=True)
+            if macro_fig is None:
+                st.info("No meal logs found")
+            else:
+                st.plotly_chart(macro_fig, use_container_width=True, key="weekly_macros")
+
 
 # Monthly Tab
-with period_tab3:
+@st.fragment
+def monthly_tab_fragment(user, targets):
+    """Monthly tab: daily averages and adherence gauges for one month."""
     st.markdown("#### Monthly Summary")
 
+    seed_widget("monthly_date", date.today())
+
     col1, col2 = st.columns(2)
 
     with col1:
         month_year = st.date_input(
             "Select month",
-            value=date.today(),
             key="monthly_date"
         )
 
     year = month_year.year
     month = month_year.month
 
-    summary = monthly_summary(user.id, year, month, targets)
+    summary = cached_monthly_summary(write_version(), user.id, year, month)
 
     if summary.num_meals == 0:
         st.info(f"No meals logged for {month_year.strftime('%B %Y')}")
@@ -252,7 +302,8 @@ with period_tab3:
             render_nutrition_card(
                 summary.daily_average,
                 servings=1.0,
-                title="Daily Average"
+                title="Daily Average",
+                compact=True
             )
 
         with col2:
@@ -270,7 +321,7 @@ with period_tab3:
                 targets.calories,
                 "Calories"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="monthly_gauge_calories")
 
         with col_b:
             fig = create_adherence_gauge(
@@ -278,7 +329,7 @@ with period_tab3:
                 targets.protein_g,
                 "Protein"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="monthly_gauge_protein")
 
         with col_c:
             fig = create_adherence_gauge(
@@ -286,7 +337,7 @@ with period_tab3:
                 targets.carbs_g,
                 "Carbs"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="monthly_gauge_carbs")
 
         with col_d:
             fig = create_adherence_gauge(
@@ -294,21 +345,25 @@ with period_tab3:
                 targets.fat_g,
                 "Fat"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="monthly_gauge_fat")
+
 
 # Yearly Tab
-with period_tab4:
+@st.fragment
+def yearly_tab_fragment(user, targets):
+    """Yearly tab: daily averages and trend charts for one year."""
     st.markdown("#### Yearly Summary")
 
+    seed_widget("yearly_year", date.today().year)
+
     selected_year = st.number_input(
         "Select year",
         min_value=2020,
         max_value=2030,
-        value=date.today().year,
         key="yearly_year"
     )
 
-    summary = yearly_summary(user.id, selected_year, targets)
+    summary = cached_yearly_summary(write_version(), user.id, selected_year)
 
     if summary.num_meals == 0:
         st.info(f"No meals logged for {selected_year}")
@@ -323,7 +378,8 @@ with period_tab4:
             render_nutrition_card(
                 summary.daily_average,
                 servings=1.0,
-                title="Daily Average"
+                title="Daily Average",
+                compact=True
             )
 
         with col2:
@@ -336,17 +392,37 @@ with period_tab4:
         # Get all logs for the year
         start_date = date(selected_year, 1, 1)
         end_date = date(selected_year, 12, 31)
-        meal_logs = get_meal_logs(user.id, start_date, end_date)
+        daily_df = logs_to_daily_df(write_version(), user.id, start_date, end_date)
+        trend_fig = create_daily_calories_trend(daily_df)
+        macro_fig = create_macro_stacked_bar(daily_df, targets)
 
         col_a, col_b = st.columns(2)
 
         with col_a:
-            fig = create_daily_calories_trend(meal_logs)
-            st.plotly_chart(fig, use_container_width=True)
+            if trend_fig is None:
+                st.info("No meal logs found")
+            else:
+                st.plotly_chart(trend_fig, use_container_width=True, key="yearly_trend")
 
         with col_b:
-            fig = create_macro_stacked_bar(meal_logs, targets)
-            st.plotly_chart(fig, use_container_width=True)
+            if macro_fig is None:
+                st.info("No meal logs found")
+            else:
+                st.plotly_chart(macro_fig, use_container_width=True, key="yearly_macros")
+
+
+# Each tab is a fragment: changing its own widgets reruns only that tab
+with period_tab1:
+    daily_tab_fragment(user, targets)
+
+with period_tab2:
+    weekly_tab_fragment(user, targets)
+
+with period_tab3:
+    monthly_tab_fragment(user, targets)
+
+with period_tab4:
+    yearly_tab_fragment(user, targets)
 
 st.markdown("---")
 st.caption("💡 **Tip:** Log your meals daily to track adherence to your macro targets and see progress over time.")
@@ -0,0 +1,37 @@
+"""Vectorized macro adherence scoring shared by the pages and charts.
+
+Adherence is 100% at an exact match and drops one point per percent of
+deviation from the target, floored at 0. A zero target counts as 100%.
+"""
+
+import numpy as np
+
+# Adherence levels returned by adherence_levels(): <=70%, <=90%, >90%
+POOR, FAIR, GOOD = 0, 1, 2
+_LEVEL_THRESHOLDS = np.array([70.0, 90.0])
+
+
+def adherence_vec(actual, target) -> np.ndarray:
+    """Calculate adherence percentages element-wise.
+
+    Args:
+        actual: Array-like of actual values
+        target: Array-like of target values, same shape as actual
+
+    Returns:
+        Float array of adherence percentages in [0, 100]
+    """
+    actual = np.asarray(actual, dtype=float)
+    target = np.asarray(target, dtype=float)
+    zero = target == 0
+    deviation = np.abs(actual - target) / np.where(zero, 1.0, target)
+    return np.where(zero, 100.0, np.maximum(0.0, 100.0 - deviation * 100.0))
+
+
+def adherence_levels(pcts) -> np.ndarray:
+    """Map adherence percentages to POOR/FAIR/GOOD level indices.
+
+    Counts the thresholds strictly below each value (side='left'), so
+    exactly 90% is FAIR and exactly 70% is POOR.
+    """
+    return np.searchsorted(_LEVEL_THRESHOLDS, pcts, side='left')
@@ -1,9 +1,49 @@
-"""Chart components using Plotly for data visualization."""
+"""Chart components using Plotly for data visualization.
+
+Figure factories are memoized with st.cache_data, so a rerun with
+unchanged inputs returns the cached figure instead of rebuilding it.
+"""
 
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 import pandas as pd
+import streamlit as st
 from meal_planner.models import MacroTargets
+from pages.components.adherence import adherence_levels, adherence_vec
+
+MACRO_COLORS = ['#FF6B6B', '#4ECDC4', '#FFE66D']
+
+# Gauge bar color per adherence level (POOR, FAIR, GOOD)
+GAUGE_COLORS = ("red", "orange", "darkgreen")
+
+# Static layouts, built once. A constant uirevision tells Plotly.js to keep
+# the user's zoom/pan/legend state when a rerun sends an updated figure.
+_PIE_LAYOUT = dict(title="Macro Calorie Distribution", uirevision="macro_pie")
+_TREND_LAYOUT = dict(
+    title='Daily Calorie Intake',
+    xaxis_title="Date",
+    yaxis_title="Calories (kcal)",
+    hovermode='x unified',
+    uirevision="calorie_trend"
+)
+_BAR_LAYOUT = dict(
+    title='Daily Macro Breakdown',
+    barmode='stack',
+    xaxis_title="Date",
+    yaxis_title="Grams",
+    hovermode='x unified',
+    legend_title="Macros",
+    uirevision="macro_bar"
+)
+
+# Serialize figures with orjson (numpy arrays included) when it is installed
+try:
+    pio.json.config.default_engine = "orjson"
+except ValueError:
+    pass  # orjson missing: plotly keeps its stdlib json encoder
+
+# Above this many points the calorie trend renders with WebGL (Scattergl)
+WEBGL_POINT_THRESHOLD = 1000
 
 
 def create_macro_pie_chart(targets: MacroTargets):
@@ -15,25 +55,34 @@ def create_macro_pie_chart(targets: MacroTargets):
     Returns:
         Plotly figure
     """
+    return _build_pie(targets.protein_g, targets.carbs_g, targets.fat_g)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_pie(protein_g: float, carbs_g: float, fat_g: float):
+    """Build the macro pie, memoized on the three gram targets only."""
     labels = ['Protein', 'Carbs', 'Fat']
     values = [
-        targets.protein_g * 4,  # 4 cal/g
-        targets.carbs_g * 4,    # 4 cal/g
-        targets.fat_g * 9       # 9 cal/g
+        protein_g * 4,  # 4 cal/g
+        carbs_g * 4,    # 4 cal/g
+        fat_g * 9       # 9 cal/g
     ]
 
-    fig = px.pie(
-        names=labels,
+    fig = go.Figure(go.Pie(
+        labels=labels,
         values=values,
-        title="Macro Calorie Distribution",
-        color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#FFE66D']
-    )
+        marker_colors=MACRO_COLORS,
+        sort=False,
+        textposition='inside',
+        textinfo='percent+label'
+    ))
 
-    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(**_PIE_LAYOUT)
 
     return fig
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def create_adherence_gauge(actual: float, target: float, label: str):
     """Create gauge chart for single macro adherence.
 
@@ -45,19 +94,9 @@ def create_adherence_gauge(actual: float, target: float, label: str):
     Returns:
         Plotly figure
     """
-    # Calculate adherence percentage
-    if target > 0:
-        pct = max(0, 100 - abs(actual - target) / target * 100)
-    else:
-        pct = 100
-
-    # Determine color
-    if pct > 90:
-        color = "darkgreen"
-    elif pct > 70:
-        color = "orange"
-    else:
-        color = "red"
+    pcts = adherence_vec([actual], [target])
+    pct = float(pcts[0])
+    color = GAUGE_COLORS[adherence_levels(pcts)[0]]
 
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
@@ -83,112 +122,74 @@ def create_adherence_gauge(actual: float, target: float, label: str):
     return fig
 
 
-def create_daily_calories_trend(meal_logs: list):
+@st.cache_data(show_spinner=False, max_entries=32)
+def create_daily_calories_trend(daily_df: pd.DataFrame):
     """Create line chart of daily calories over time.
 
+    Long histories switch to go.Scattergl, which draws on a WebGL canvas
+    instead of one SVG node per point (at the cost of crisp SVG export).
+
     Args:
-        meal_logs: List of MealLog objects with logged_at and recipe
+        daily_df: Per-day totals from logs_to_daily_df
 
     Returns:
-        Plotly figure
+        Plotly figure, or None if daily_df is empty
     """
-    # Group by date, sum calories
-    data = {}
-    for log in meal_logs:
-        date_key = log.logged_at.date()
-        if log.recipe and log.recipe.nutrition:
-            cal = log.recipe.nutrition.calories * log.servings
-            data[date_key] = data.get(date_key, 0) + cal
-
-    if not data:
-        # Return empty chart if no data
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No meal logs found",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False
-        )
-        return fig
-
-    df = pd.DataFrame(list(data.items()), columns=['Date', 'Calories'])
-    df = df.sort_values('Date')
-
-    fig = px.line(
-        df,
-        x='Date',
-        y='Calories',
-        title='Daily Calorie Intake',
-        markers=True
-    )
+    if daily_df.empty:
+        return None
+
+    trace_cls = go.Scattergl if len(daily_df) > WEBGL_POINT_THRESHOLD else go.Scatter
+    fig = go.Figure(trace_cls(
+        x=daily_df['date'].to_numpy(),
+        y=daily_df['calories'].to_numpy(),
+        mode='lines+markers',
+        name='Calories'
+    ))
 
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Calories (kcal)",
-        hovermode='x unified'
-    )
+    fig.update_layout(**_TREND_LAYOUT)
 
     return fig
 
 
-def create_macro_stacked_bar(meal_logs: list, targets: MacroTargets = None):
+@st.cache_data(show_spinner=False, max_entries=32)
+def create_macro_stacked_bar(daily_df: pd.DataFrame, targets: MacroTargets = None):
     """Create stacked bar chart of protein/carbs/fat per day.
 
     Args:
-        meal_logs: List of MealLog objects
-        targets: Optional MacroTargets for reference lines
+        daily_df: Per-day totals from logs_to_daily_df
+        targets: Optional MacroTargets for protein/carbs/fat reference lines
 
     Returns:
-        Plotly figure
+        Plotly figure, or None if daily_df is empty
     """
-    # Group by date, sum macros
-    data = {}
-    for log in meal_logs:
-        date_key = log.logged_at.date()
-        if log.recipe and log.recipe.nutrition:
-            n = log.recipe.nutrition.scaled(log.servings)
-            if date_key not in data:
-                data[date_key] = {'protein': 0, 'carbs': 0, 'fat': 0}
-            data[date_key]['protein'] += n.protein_g
-            data[date_key]['carbs'] += n.carbs_g
-            data[date_key]['fat'] += n.fat_g
-
-    if not data:
-        # Return empty chart if no data
-        fig = go.Figure()
-        fig.add_annotation(
-            text="No meal logs found",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False
+    if daily_df.empty:
+        return None
+
+    dates = daily_df['date'].to_numpy()
+    fig = go.Figure([
+        go.Bar(x=dates, y=daily_df[column].to_numpy(), name=name, marker_color=color)
+        for name, column, color in zip(
+            ['Protein', 'Carbs', 'Fat'], ['protein_g', 'carbs_g', 'fat_g'], MACRO_COLORS
         )
-        return fig
-
-    df = pd.DataFrame.from_dict(data, orient='index').reset_index()
-    df.columns = ['Date', 'Protein', 'Carbs', 'Fat']
-    df = df.sort_values('Date')
-
-    fig = px.bar(
-        df,
-        x='Date',
-        y=['Protein', 'Carbs', 'Fat'],
-        title='Daily Macro Breakdown',
-        barmode='stack',
-        color_discrete_sequence=['#FF6B6B', '#4ECDC4', '#FFE66D']
-    )
-
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Grams",
-        hovermode='x unified',
-        legend_title="Macros"
-    )
-
-    # Add target reference lines if provided
+    ])
+
+    # Target reference lines go in with the layout, in a single update
+    shapes, annotations = [], []
     if targets:
-        fig.add_hline(
-            y=targets.protein_g,
-            line_dash="dash",
-            annotation_text="Protein Target",
-            line_color="red"
-        )
+        for name, value, color in (
+            ('Protein', targets.protein_g, 'red'),
+            ('Carbs', targets.carbs_g, 'teal'),
+            ('Fat', targets.fat_g, 'gold'),
+        ):
+            shapes.append(dict(
+                type='line', xref='paper', x0=0, x1=1, yref='y', y0=value, y1=value,
+                line=dict(dash='dash', color=color)
+            ))
+            annotations.append(dict(
+                text=f"{name} Target", xref='paper', x=1, yref='y', y=value,
+                xanchor='right', yanchor='bottom', showarrow=False
+            ))
+
+    fig.update_layout(**_BAR_LAYOUT, shapes=shapes, annotations=annotations)
 
     return fig
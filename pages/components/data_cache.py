@@ -0,0 +1,179 @@
+"""Cached data loaders shared by the Streamlit pages.
+
+Streamlit re-executes a page top to bottom on every widget interaction.
+These helpers memoize the expensive database reads and aggregations so
+that reruns with unchanged inputs are a cache lookup.
+"""
+
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from meal_planner.planner import load_meal_plan
+from meal_planner.recipe_sources import export_recipes_csv_bytes
+from meal_planner.recipe_store import get_all_recipes, recipe_count
+from meal_planner.models import MealPlan, NutritionSummary, Recipe
+from meal_planner.tracker import (
+    daily_summary, get_meal_logs, monthly_summary, weekly_summary, yearly_summary
+)
+
+DAILY_COLUMNS = ['date', 'calories', 'protein_g', 'carbs_g', 'fat_g']
+
+
+class RecipeRow(NamedTuple):
+    """A recipe with its table cells pre-formatted for display."""
+    recipe: Recipe
+    title_cf: str  # casefolded title for case-insensitive search
+    total_time: object  # minutes, or "N/A"
+    calories: str
+    protein: str
+    carbs: str
+    fat: str
+    meal_types: str
+    source: str
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def logs_to_daily_df(db_version: tuple, user_id: int, start: date, end: date) -> pd.DataFrame:
+    """Load meal logs in [start, end] and total nutrition per day.
+
+    Args:
+        db_version: meal_planner.db.write_version() (cache key only)
+        user_id: User whose logs to load
+        start: First day of the range (inclusive)
+        end: Last day of the range (inclusive)
+
+    Returns:
+        DataFrame with one row per logged day, sorted by date, and
+        columns date, calories, protein_g, carbs_g, fat_g
+    """
+    # Filter once, so the array builds below are branch-free
+    valid = [
+        (log.logged_at.date(), log.recipe.nutrition, log.servings)
+        for log in get_meal_logs(user_id, start, end)
+        if log.recipe is not None and log.recipe.nutrition is not None
+    ]
+    if not valid:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    # Struct-of-arrays: one day per log, one row of macros per log,
+    # scaled by servings in a single vectorized multiply
+    log_days, nutritions, servings = zip(*valid)
+    dates = np.array(log_days, dtype='datetime64[D]')
+    totals = np.array([
+        (n.calories, n.protein_g, n.carbs_g, n.fat_g) for n in nutritions
+    ]) * np.array(servings)[:, None]
+
+    # Sort by day, then sum each run of equal days in one pass
+    order = np.argsort(dates, kind='stable')
+    dates, totals = dates[order], totals[order]
+    days, starts = np.unique(dates, return_index=True)
+    daily = np.add.reduceat(totals, starts, axis=0)
+
+    # Columns are already sorted by day; build the frame in one step
+    return pd.DataFrame({
+        'date': days,
+        'calories': daily[:, 0],
+        'protein_g': daily[:, 1],
+        'carbs_g': daily[:, 2],
+        'fat_g': daily[:, 3],
+    })
+
+
+# Summaries are keyed on meal_planner.db.write_version(), which changes
+# after any committed write, so no session ever sees a stale entry
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_daily_summary(db_version: tuple, user_id: int, target_date: date) -> NutritionSummary:
+    """daily_summary memoized per (user, day, db_version)."""
+    return daily_summary(user_id, target_date)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_weekly_summary(db_version: tuple, user_id: int, week_start: date) -> NutritionSummary:
+    """weekly_summary memoized per (user, week, db_version)."""
+    return weekly_summary(user_id, week_start)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_monthly_summary(db_version: tuple, user_id: int, year: int, month: int) -> NutritionSummary:
+    """monthly_summary memoized per (user, month, db_version)."""
+    return monthly_summary(user_id, year, month)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_yearly_summary(db_version: tuple, user_id: int, year: int) -> NutritionSummary:
+    """yearly_summary memoized per (user, year, db_version)."""
+    return yearly_summary(user_id, year)
+
+
+@st.cache_data(show_spinner=False, ttl=60)
+def cached_recipe_count() -> int:
+    """recipe_count memoized for up to a minute."""
+    return recipe_count()
+
+
+@st.cache_data(show_spinner=False, ttl=60)
+def cached_load_meal_plan(user_id: int, week_start: date) -> MealPlan:
+    """load_meal_plan memoized for up to a minute.
+
+    Returns a copy of the cached plan; call cached_load_meal_plan.clear()
+    after saving or replacing a plan.
+    """
+    return load_meal_plan(user_id, week_start)
+
+
+# Recipe loaders are keyed on meal_planner.db.write_version() too, so
+# recipes added by the CLI or another process show up on the next rerun
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_recipe_options(db_version: tuple) -> tuple:
+    """Load all recipes with their selectbox labels.
+
+    Returns:
+        Tuple of (recipes, labels, id_to_recipe) where labels are
+        "<id> - <title>" strings in the same order as recipes
+    """
+    recipes = get_all_recipes()
+    labels = tuple(f"{r.id} - {r.title}" for r in recipes)
+    id_to_recipe = {r.id: r for r in recipes}
+    return recipes, labels, id_to_recipe
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_recipe_rows(db_version: tuple) -> tuple:
+    """Load all recipes as RecipeRow tuples for the recipe browser.
+
+    Formatting happens once per cache fill instead of on every rerun.
+    """
+    rows = []
+    for recipe in load_recipe_options(db_version)[0]:
+        total_time = recipe.prep_time_minutes + recipe.cook_time_minutes
+        n = recipe.nutrition
+        rows.append(RecipeRow(
+            recipe=recipe,
+            title_cf=recipe.title.casefold(),
+            total_time=total_time if total_time > 0 else "N/A",
+            calories=f"{n.calories:.0f}" if n else "N/A",
+            protein=f"{n.protein_g:.0f}" if n else "N/A",
+            carbs=f"{n.carbs_g:.0f}" if n else "N/A",
+            fat=f"{n.fat_g:.0f}" if n else "N/A",
+            meal_types=recipe.meal_types_display,
+            source=recipe.source.title(),
+        ))
+    return tuple(rows)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_recipes_csv_bytes(db_version: tuple) -> bytes:
+    """CSV export of all recipes, for the download button."""
+    return export_recipes_csv_bytes()
+
+
+def clear_recipe_caches() -> None:
+    """Drop cached recipe data after recipes are added or removed."""
+    cached_recipe_count.clear()
+    load_recipe_options.clear()
+    load_recipe_rows.clear()
+    load_recipes_csv_bytes.clear()
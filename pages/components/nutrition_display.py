@@ -1,25 +1,45 @@
 """Nutrition display components for Streamlit pages."""
 
+import pandas as pd
 import streamlit as st
 from meal_planner.models import Nutrition, MacroTargets
+from pages.components.adherence import adherence_levels, adherence_vec
 
+# Message box per adherence level (POOR, FAIR, GOOD)
+ADHERENCE_MESSAGES = (st.error, st.warning, st.success)
 
-def render_nutrition_card(nutrition: Nutrition, servings: float = 1.0, title: str = "Nutrition Facts"):
+
+def render_nutrition_card(nutrition: Nutrition, servings: float = 1.0, title: str = "Nutrition Facts",
+                          compact: bool = False):
     """Render a nutrition label-style card with metrics.
 
     Args:
         nutrition: Nutrition object
         servings: Serving multiplier (default 1.0)
         title: Card title (default "Nutrition Facts")
+        compact: Show the four macros as a one-row table instead of four
+            metric widgets (default False)
     """
     scaled = nutrition.scaled(servings)
 
     st.markdown(f"### {title}")
-    cols = st.columns(4)
-    cols[0].metric("Calories", f"{scaled.calories:.0f}")
-    cols[1].metric("Protein", f"{scaled.protein_g:.0f}g")
-    cols[2].metric("Carbs", f"{scaled.carbs_g:.0f}g")
-    cols[3].metric("Fat", f"{scaled.fat_g:.0f}g")
+    if compact:
+        st.dataframe(
+            pd.DataFrame({
+                "Calories": [f"{scaled.calories:.0f}"],
+                "Protein": [f"{scaled.protein_g:.0f}g"],
+                "Carbs": [f"{scaled.carbs_g:.0f}g"],
+                "Fat": [f"{scaled.fat_g:.0f}g"],
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        cols = st.columns(4)
+        cols[0].metric("Calories", f"{scaled.calories:.0f}")
+        cols[1].metric("Protein", f"{scaled.protein_g:.0f}g")
+        cols[2].metric("Carbs", f"{scaled.carbs_g:.0f}g")
+        cols[3].metric("Fat", f"{scaled.fat_g:.0f}g")
 
     # Show macro percentages
     pcts = scaled.macro_percentages()
@@ -48,33 +68,14 @@ def render_target_comparison(actual: Nutrition, target: MacroTargets):
     """
     st.markdown("### Target Adherence")
 
-    def adherence_pct(actual_val: float, target_val: float) -> float:
-        """Calculate adherence percentage (100% = perfect match)."""
-        if target_val == 0:
-            return 100.0
-        deviation = abs(actual_val - target_val) / target_val
-        return max(0, 100 - deviation * 100)
-
-    def get_color(pct: float) -> str:
-        """Get color based on adherence percentage."""
-        if pct > 90:
-            return "green"
-        elif pct > 70:
-            return "orange"
-        else:
-            return "red"
-
-    metrics = [
-        ("Calories", actual.calories, target.calories),
-        ("Protein", actual.protein_g, target.protein_g),
-        ("Carbs", actual.carbs_g, target.carbs_g),
-        ("Fat", actual.fat_g, target.fat_g),
-    ]
+    labels = ["Calories", "Protein", "Carbs", "Fat"]
+    actual_vals = [actual.calories, actual.protein_g, actual.carbs_g, actual.fat_g]
+    target_vals = [target.calories, target.protein_g, target.carbs_g, target.fat_g]
 
-    for label, actual_val, target_val in metrics:
-        pct = adherence_pct(actual_val, target_val)
-        color = get_color(pct)
+    pcts = adherence_vec(actual_vals, target_vals)
+    levels = adherence_levels(pcts)
 
+    for label, actual_val, target_val, pct, level in zip(labels, actual_vals, target_vals, pcts, levels):
         col1, col2, col3 = st.columns([2, 2, 1])
         with col1:
             st.metric(label, f"{actual_val:.0f}", delta=f"Target: {target_val:.0f}")
@@ -82,9 +83,4 @@ def render_target_comparison(actual: Nutrition, target: MacroTargets):
             st.progress(min(pct / 100, 1.0))
         with col3:
             # Color-coded adherence text
-            if color == "green":
-                st.success(f"{pct:.0f}%")
-            elif color == "orange":
-                st.warning(f"{pct:.0f}%")
-            else:
-                st.error(f"{pct:.0f}%")
+            ADHERENCE_MESSAGES[level](f"{pct:.0f}%")
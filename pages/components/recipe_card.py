@@ -1,10 +1,20 @@
 """Recipe card display components for Streamlit pages."""
 
+import re
+
 import streamlit as st
 from meal_planner.models import Recipe
 from pages.components.nutrition_display import render_nutrition_card
 
 
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]()#+\-.!|~<>$:])")
+
+
+def _escape_markdown(text: str) -> str:
+    """Backslash-escape markdown syntax so scraped text renders literally."""
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", " ".join(text.split()))
+
+
 def render_recipe_summary(recipe: Recipe):
     """Compact recipe card for lists.
 
@@ -15,9 +25,8 @@ def render_recipe_summary(recipe: Recipe):
         col1, col2 = st.columns([3, 1])
         with col1:
             st.markdown(f"**{recipe.title}**")
-            meal_types_str = ', '.join([mt.capitalize() for mt in recipe.meal_types])
             cuisine_str = f" | {recipe.cuisine}" if recipe.cuisine else ""
-            st.caption(f"{meal_types_str}{cuisine_str}")
+            st.caption(f"{recipe.meal_types_display}{cuisine_str}")
         with col2:
             if recipe.nutrition:
                 st.metric("Cal", f"{recipe.nutrition.calories:.0f}")
@@ -49,8 +58,7 @@ def render_recipe_detail(recipe: Recipe):
 
     # Meal types
     if recipe.meal_types:
-        meal_types_str = ', '.join([mt.capitalize() for mt in recipe.meal_types])
-        st.info(f"**Meal Types:** {meal_types_str}")
+        st.info(f"**Meal Types:** {recipe.meal_types_display}")
 
     # Nutrition
     if recipe.nutrition:
@@ -60,19 +68,22 @@ def render_recipe_detail(recipe: Recipe):
     # Ingredients
     if recipe.ingredients:
         st.markdown("### Ingredients")
+        # One markdown element for the whole list; notes sit on a
+        # second (gray) line of their item
+        lines = []
         for ing in recipe.ingredients:
-            if ing.quantity and ing.unit:
-                st.markdown(f"- {ing.quantity} {ing.unit} {ing.name}")
-            else:
-                st.markdown(f"- {ing.name}")
+            qty = f"{ing.quantity} {ing.unit} " if ing.quantity and ing.unit else ""
+            lines.append(f"- {qty}{ing.name}")
             if ing.notes:
-                st.caption(f"  _{ing.notes}_")
+                lines[-1] += f"  \n  :gray[_{_escape_markdown(ing.notes)}_]"
+        st.markdown("\n".join(lines))
         st.markdown("---")
 
     # Instructions
     if recipe.instructions:
         st.markdown("### Instructions")
-        for i, step in enumerate(recipe.instructions, 1):
-            st.markdown(f"**{i}.** {step}")
+        st.markdown("\n\n".join(
+            f"**{i}.** {step}" for i, step in enumerate(recipe.instructions, 1)
+        ))
     else:
         st.info("No instructions available")
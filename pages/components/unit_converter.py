@@ -4,15 +4,22 @@ Display in imperial (lbs, feet/inches) for user-friendly forms.
 Store in metric (kg, cm) in database for consistency with CLI.
 """
 
+from functools import lru_cache
+
 # Conversion constants
 LBS_PER_KG = 2.20462
 CM_PER_INCH = 2.54
 INCHES_PER_FOOT = 12
 
+# Folded at import so each conversion is a multiply, not a divide
+_INV_LBS_PER_KG = 1.0 / LBS_PER_KG
+_INCHES_PER_CM = 1.0 / CM_PER_INCH
+_CM_PER_FOOT = INCHES_PER_FOOT * CM_PER_INCH
+
 
 def lbs_to_kg(lbs: float) -> float:
     """Convert pounds to kilograms."""
-    return lbs / LBS_PER_KG
+    return lbs * _INV_LBS_PER_KG
 
 
 def kg_to_lbs(kg: float) -> float:
@@ -20,14 +27,16 @@ def kg_to_lbs(kg: float) -> float:
     return kg * LBS_PER_KG
 
 
+@lru_cache(maxsize=256)
 def ft_in_to_cm(feet: int, inches: int) -> float:
     """Convert feet and inches to centimeters."""
-    return (feet * INCHES_PER_FOOT + inches) * CM_PER_INCH
+    return feet * _CM_PER_FOOT + inches * CM_PER_INCH
 
 
+@lru_cache(maxsize=256)
 def cm_to_ft_in(cm: float) -> tuple:
     """Convert centimeters to (feet, inches)."""
-    total_inches = cm / CM_PER_INCH
+    total_inches = cm * _INCHES_PER_CM
     feet = int(total_inches // INCHES_PER_FOOT)
     inches = int(round(total_inches % INCHES_PER_FOOT))
     if inches == 12:
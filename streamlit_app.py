@@ -17,10 +17,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize DB once per session
-if 'db_initialized' not in st.session_state:
+
+@st.cache_resource(show_spinner=False)
+def _ensure_db() -> bool:
+    """Create the schema once per server process, shared by all sessions."""
     init_db()
-    st.session_state.db_initialized = True
+    return True
+
+
+_ensure_db()
 
 # Initialize session state variables
 if 'user_profile' not in st.session_state:
@@ -119,15 +124,14 @@ with col1:
 with col2:
     st.markdown("#### 📊 Quick Stats")
     # Show some quick stats
-    from meal_planner.recipe_store import recipe_count
-    from meal_planner.planner import load_meal_plan
+    from pages.components.data_cache import cached_load_meal_plan, cached_recipe_count
 
-    num_recipes = recipe_count()
+    num_recipes = cached_recipe_count()
     st.write(f"**Total Recipes:** {num_recipes}")
 
     if st.session_state.user_profile:
         user = st.session_state.user_profile
-        plan = load_meal_plan(user.id, st.session_state.current_week_start)
+        plan = cached_load_meal_plan(user.id, st.session_state.current_week_start)
         if plan:
             st.write(f"**Meal Plan:** ✓ Active for this week")
         else:
@@ -0,0 +1,123 @@
+"""Tests for the cached connection and transaction handling."""
+
+import sqlite3
+import threading
+import unittest
+import uuid
+
+from meal_planner.db import close_connections, get_connection, init_db
+
+
+class TestGetConnection(unittest.TestCase):
+    def setUp(self):
+        self.db_path = f"file:test_db_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.keeper = sqlite3.connect(self.db_path, uri=True)
+        init_db(self.db_path)
+
+    def tearDown(self):
+        close_connections()
+        self.keeper.close()
+
+    def _insert_user(self, conn):
+        conn.execute(
+            """INSERT INTO users (name, age, weight_kg, height_cm, sex, activity_level, goal)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            ("Test User", 30, 80, 180, "male", "moderately_active", "maintain"),
+        )
+
+    def _count_users(self):
+        with get_connection(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def test_reuses_connection(self):
+        with get_connection(self.db_path) as first:
+            pass
+        with get_connection(self.db_path) as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_shares_connection_across_threads(self):
+        seen = []
+
+        def worker():
+            with get_connection(self.db_path) as conn:
+                self._insert_user(conn)
+                seen.append(conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        with get_connection(self.db_path) as conn:
+            self.assertIs(seen[0], conn)
+        self.assertEqual(self._count_users(), 1)
+
+    def test_close_connections(self):
+        with get_connection(self.db_path) as first:
+            pass
+        close_connections()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            first.execute("SELECT 1")
+        with get_connection(self.db_path) as second:
+            self.assertIsNot(first, second)
+
+    def test_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with get_connection(self.db_path) as conn:
+                self._insert_user(conn)
+                raise RuntimeError("boom")
+        self.assertEqual(self._count_users(), 0)
+
+    def test_nested_joins_outer_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with get_connection(self.db_path) as outer:
+                with get_connection(self.db_path) as inner:
+                    self._insert_user(inner)
+                raise RuntimeError("boom")
+        self.assertEqual(self._count_users(), 0)
+
+
+class TestInitDb(unittest.TestCase):
+    def setUp(self):
+        self.db_path = f"file:test_init_db_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self.keeper = sqlite3.connect(self.db_path, uri=True)
+
+    def tearDown(self):
+        close_connections()
+        self.keeper.close()
+
+    def _insert_user_and_recipe(self, conn):
+        conn.execute(
+            """INSERT INTO users (name, age, weight_kg, height_cm, sex, activity_level, goal)
+               VALUES ('Test User', 30, 80, 180, 'male', 'moderately_active', 'maintain')"""
+        )
+        conn.execute("INSERT INTO recipes (title) VALUES ('Soup')")
+        conn.execute(
+            """INSERT INTO recipe_nutrition (recipe_id, calories, protein_g, carbs_g, fat_g)
+               VALUES (1, 300, 20, 40, 8)"""
+        )
+
+    def test_migrates_old_meal_log(self):
+        # Roll meal_log back to its original columns
+        init_db(self.db_path)
+        with get_connection(self.db_path) as conn:
+            self._insert_user_and_recipe(conn)
+            conn.execute("DROP INDEX idx_meal_log_user_day")
+            for column in ("log_day", "calories", "protein_g", "carbs_g", "fat_g",
+                           "fiber_g", "sugar_g", "sodium_mg"):
+                conn.execute(f"ALTER TABLE meal_log DROP COLUMN {column}")
+            conn.execute(
+                """INSERT INTO meal_log (user_id, recipe_id, meal_type, logged_at)
+                   VALUES (1, 1, 'lunch', '2026-02-05T12:30:00')"""
+            )
+
+        init_db(self.db_path)
+
+        with get_connection(self.db_path) as conn:
+            row = conn.execute("SELECT log_day, calories, fat_g FROM meal_log").fetchone()
+        self.assertEqual(row["log_day"], "2026-02-05")
+        self.assertEqual(row["calories"], 300)
+        self.assertEqual(row["fat_g"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
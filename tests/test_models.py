@@ -1,8 +1,9 @@
 """Tests for data models."""
 
+import dataclasses
 import unittest
 
-from meal_planner.models import MacroTargets, Nutrition, NutritionSummary
+from meal_planner.models import MacroTargets, Nutrition, NutritionSummary, Recipe
 
 
 class TestNutrition(unittest.TestCase):
@@ -23,6 +24,11 @@ class TestNutrition(unittest.TestCase):
         self.assertEqual(result.carbs_g, 100)
         self.assertEqual(result.fat_g, 30)
 
+    def test_frozen(self):
+        n = Nutrition(400, 30, 50, 15)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            n.calories = 500
+
     def test_zero(self):
         z = Nutrition.zero()
         self.assertEqual(z.calories, 0)
@@ -65,5 +71,15 @@ class TestNutritionSummary(unittest.TestCase):
         self.assertIsNone(summary.adherence_pct())
 
 
+class TestRecipe(unittest.TestCase):
+    def test_meal_types_display(self):
+        recipe = Recipe(None, "Oats", "seed", meal_types=["breakfast", "lunch"])
+        self.assertEqual(recipe.meal_types_display, "Breakfast, Lunch")
+
+    def test_meal_types_display_empty(self):
+        recipe = Recipe(None, "Oats", "seed")
+        self.assertEqual(recipe.meal_types_display, "")
+
+
 if __name__ == "__main__":
     unittest.main()
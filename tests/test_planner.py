@@ -0,0 +1,74 @@
+"""Tests for weekly meal plan persistence."""
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from meal_planner.db import close_connections, get_connection, init_db
+from meal_planner.macro_calculator import calculate_macro_targets
+from meal_planner.models import UserProfile
+from meal_planner.planner import (
+    generate_weekly_plan,
+    load_meal_plan,
+    replace_meal_plan,
+    save_meal_plan,
+)
+from meal_planner.recipe_sources import import_seed_recipes
+
+
+class TestReplaceMealPlan(unittest.TestCase):
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        init_db(self.db_path)
+        import_seed_recipes(self.db_path)
+
+        with get_connection(self.db_path) as conn:
+            conn.execute(
+                """INSERT INTO users (name, age, weight_kg, height_cm, sex, activity_level, goal)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                ("Test User", 30, 80, 180, "male", "moderately_active", "maintain"),
+            )
+        self.targets = calculate_macro_targets(
+            UserProfile(1, "Test User", 30, 80, 180, "male", "moderately_active", "maintain")
+        )
+        self.week = date(2026, 2, 2)
+
+    def tearDown(self):
+        close_connections()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _plan_ids(self):
+        with get_connection(self.db_path) as conn:
+            return [row["id"] for row in conn.execute(
+                "SELECT id FROM meal_plans WHERE user_id = 1 AND week_start_date = ?",
+                (self.week.isoformat(),),
+            )]
+
+    def test_replace_deletes_old_plan(self):
+        old_id = save_meal_plan(
+            generate_weekly_plan(1, self.targets, self.week, self.db_path), self.db_path
+        )
+
+        new_plan = replace_meal_plan(1, self.week, self.targets, self.db_path)
+
+        self.assertEqual(self._plan_ids(), [new_plan.id])
+        self.assertNotEqual(new_plan.id, old_id)
+        with get_connection(self.db_path) as conn:
+            orphans = conn.execute(
+                "SELECT COUNT(*) AS cnt FROM meal_plan_entries WHERE meal_plan_id = ?", (old_id,)
+            ).fetchone()["cnt"]
+        self.assertEqual(orphans, 0)
+
+        loaded = load_meal_plan(1, self.week, self.db_path)
+        self.assertEqual(len(loaded.entries), len(new_plan.entries))
+
+    def test_replace_without_existing_plan(self):
+        new_plan = replace_meal_plan(1, self.week, self.targets, self.db_path)
+        self.assertEqual(self._plan_ids(), [new_plan.id])
+        self.assertEqual(len(new_plan.entries), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
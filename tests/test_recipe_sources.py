@@ -0,0 +1,73 @@
+"""Tests for recipe CSV import/export."""
+
+import io
+import os
+import tempfile
+import unittest
+
+from meal_planner.db import close_connections, init_db
+from meal_planner.models import Nutrition, Recipe
+from meal_planner.recipe_sources import (
+    CSV_COLUMNS,
+    export_recipes_csv_bytes,
+    import_recipes_csv_buffer,
+)
+from meal_planner.recipe_store import get_all_recipes, save_recipe
+
+
+class TestRecipeCsv(unittest.TestCase):
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        init_db(self.db_path)
+
+    def tearDown(self):
+        close_connections()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_import_buffer(self):
+        csv_text = io.StringIO(
+            ",".join(CSV_COLUMNS) + "\n"
+            'Oatmeal,csv,,1,5,5,breakfast,,[],"[""Cook oats""]",350,12,60,7,8,5,100\n'
+        )
+        count = import_recipes_csv_buffer(csv_text, self.db_path)
+        self.assertEqual(count, 1)
+
+        recipes = get_all_recipes(self.db_path)
+        self.assertEqual(len(recipes), 1)
+        self.assertEqual(recipes[0].title, "Oatmeal")
+        self.assertEqual(recipes[0].instructions, ["Cook oats"])
+        self.assertAlmostEqual(recipes[0].nutrition.calories, 350)
+
+    def test_import_buffer_skips_duplicates(self):
+        csv_text = ",".join(CSV_COLUMNS) + "\nOatmeal,csv,,1,5,5,breakfast,,,,350,12,60,7,,,\n"
+        import_recipes_csv_buffer(io.StringIO(csv_text), self.db_path)
+        count = import_recipes_csv_buffer(io.StringIO(csv_text), self.db_path)
+        self.assertEqual(count, 0)
+
+    def test_export_bytes_round_trip(self):
+        save_recipe(Recipe(
+            id=None, title="Crème Brûlée", source="test",
+            meal_types=["dinner"], instructions=["Bake", "Torch"],
+            nutrition=Nutrition(400, 6, 30, 28),
+        ), self.db_path)
+
+        data = export_recipes_csv_bytes(self.db_path)
+        self.assertIsInstance(data, bytes)
+
+        fd, other_db = tempfile.mkstemp(suffix=".db")
+        try:
+            init_db(other_db)
+            count = import_recipes_csv_buffer(io.StringIO(data.decode("utf-8")), other_db)
+            self.assertEqual(count, 1)
+            recipe = get_all_recipes(other_db)[0]
+            self.assertEqual(recipe.title, "Crème Brûlée")
+            self.assertEqual(recipe.instructions, ["Bake", "Torch"])
+        finally:
+            close_connections()
+            os.close(fd)
+            os.unlink(other_db)
+
+
+if __name__ == "__main__":
+    unittest.main()
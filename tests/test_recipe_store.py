@@ -0,0 +1,67 @@
+"""Tests for the recipe persistence layer."""
+
+import os
+import tempfile
+import unittest
+
+from meal_planner.db import close_connections, init_db
+from meal_planner.models import Nutrition, Recipe
+from meal_planner.recipe_store import (
+    get_all_recipes,
+    get_recipe,
+    get_recipes_with_nutrition,
+    save_recipe,
+    save_recipes,
+)
+
+
+class TestRecipeStore(unittest.TestCase):
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        init_db(self.db_path)
+
+        self.with_id = save_recipe(Recipe(
+            id=None, title="B Soup", source="test", meal_types=["lunch", "dinner"],
+            nutrition=Nutrition(250, 10, 30, 8, fiber_g=4),
+        ), self.db_path)
+        self.without_id = save_recipe(Recipe(
+            id=None, title="A Salad", source="test", meal_types=["lunch"],
+        ), self.db_path)
+
+    def tearDown(self):
+        close_connections()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def test_get_all_recipes_joins_nutrition(self):
+        recipes = get_all_recipes(self.db_path)
+        self.assertEqual([r.title for r in recipes], ["A Salad", "B Soup"])
+        self.assertIsNone(recipes[0].nutrition)
+        self.assertEqual(recipes[1].nutrition, Nutrition(250, 10, 30, 8, fiber_g=4))
+        self.assertEqual(recipes[1].meal_types, ["lunch", "dinner"])
+
+    def test_get_recipe(self):
+        self.assertEqual(get_recipe(self.with_id, self.db_path).nutrition.calories, 250)
+        self.assertIsNone(get_recipe(self.without_id, self.db_path).nutrition)
+        self.assertIsNone(get_recipe(9999, self.db_path))
+
+    def test_get_recipes_with_nutrition(self):
+        recipes = get_recipes_with_nutrition(self.db_path)
+        self.assertEqual([r.id for r in recipes], [self.with_id])
+
+    def test_save_recipes(self):
+        ids = save_recipes([
+            Recipe(id=None, title="C Stew", source="test",
+                   nutrition=Nutrition(400, 25, 35, 15)),
+            Recipe(id=None, title="D Toast", source="test"),
+        ], self.db_path)
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(get_recipe(ids[0], self.db_path).title, "C Stew")
+        self.assertEqual(get_recipe(ids[0], self.db_path).nutrition.calories, 400)
+        self.assertEqual(get_recipe(ids[1], self.db_path).title, "D Toast")
+        self.assertIsNone(get_recipe(ids[1], self.db_path).nutrition)
+        self.assertEqual(save_recipes([], self.db_path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
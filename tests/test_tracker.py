@@ -1,30 +1,41 @@
 """Tests for the tracking and analytics module."""
 
-import os
-import tempfile
+import sqlite3
 import unittest
+import uuid
 from datetime import date, datetime
 
-from meal_planner.db import init_db
+from meal_planner.db import close_connections, get_connection, init_db
 from meal_planner.models import Nutrition, Recipe
-from meal_planner.recipe_store import save_recipe
+from meal_planner.recipe_store import save_recipe, save_recipes
 from meal_planner.tracker import (
     daily_summary,
+    get_meal_logs,
     log_meal,
+    log_meals,
     monthly_summary,
     weekly_summary,
     yearly_summary,
 )
 
 
+def _memory_db_path(name: str) -> str:
+    """A uniquely named shared-cache in-memory database URI."""
+    return f"file:{name}_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
 class TestTracker(unittest.TestCase):
-    def setUp(self):
-        self.db_fd, self.db_path = tempfile.mkstemp(suffix=".db")
-        init_db(self.db_path)
+    @classmethod
+    def setUpClass(cls):
+        # Build the schema, user and recipes once; each test gets a copy.
+        # A shared-cache in-memory DB lives as long as a connection to it
+        # is open, so the class holds one to the template.
+        template_path = _memory_db_path("test_tracker_template")
+        cls._template = sqlite3.connect(template_path, uri=True)
+        init_db(template_path)
 
         # Create a test user
-        from meal_planner.db import get_connection
-        with get_connection(self.db_path) as conn:
+        with get_connection(template_path) as conn:
             conn.execute(
                 """INSERT INTO users (name, age, weight_kg, height_cm, sex, activity_level, goal)
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
@@ -32,21 +43,33 @@ class TestTracker(unittest.TestCase):
             )
 
         # Create test recipes
-        self.recipe1_id = save_recipe(Recipe(
-            id=None, title="Test Breakfast", source="test",
-            meal_types=["breakfast"],
-            nutrition=Nutrition(300, 20, 40, 8),
-        ), self.db_path)
+        cls.recipe1_id, cls.recipe2_id = save_recipes([
+            Recipe(
+                id=None, title="Test Breakfast", source="test",
+                meal_types=["breakfast"],
+                nutrition=Nutrition(300, 20, 40, 8),
+            ),
+            Recipe(
+                id=None, title="Test Lunch", source="test",
+                meal_types=["lunch"],
+                nutrition=Nutrition(500, 35, 50, 20),
+            ),
+        ], template_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        close_connections()
+        cls._template.close()
 
-        self.recipe2_id = save_recipe(Recipe(
-            id=None, title="Test Lunch", source="test",
-            meal_types=["lunch"],
-            nutrition=Nutrition(500, 35, 50, 20),
-        ), self.db_path)
+    def setUp(self):
+        # Clone the template into a fresh in-memory DB, held open for the test
+        self.db_path = _memory_db_path("test_tracker")
+        self.keeper = sqlite3.connect(self.db_path, uri=True)
+        self._template.backup(self.keeper)
 
     def tearDown(self):
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
+        close_connections()
+        self.keeper.close()
 
     def test_log_meal(self):
         log_id = log_meal(1, self.recipe1_id, "breakfast", 1.0,
@@ -54,11 +77,21 @@ class TestTracker(unittest.TestCase):
         self.assertIsNotNone(log_id)
         self.assertGreater(log_id, 0)
 
+    def test_log_meals(self):
+        log_ids = log_meals(1, [
+            (self.recipe1_id, "breakfast", 1.0, datetime(2026, 2, 5, 8, 0)),
+            (self.recipe2_id, "lunch", 1.0, datetime(2026, 2, 5, 12, 0)),
+        ], self.db_path)
+        self.assertEqual(len(log_ids), 2)
+        logs = get_meal_logs(1, date(2026, 2, 5), date(2026, 2, 5), self.db_path)
+        self.assertEqual([log.id for log in logs], log_ids)
+        self.assertEqual(logs[0].recipe_id, self.recipe1_id)
+
     def test_daily_summary(self):
-        log_meal(1, self.recipe1_id, "breakfast", 1.0,
-                 datetime(2026, 2, 5, 8, 0), self.db_path)
-        log_meal(1, self.recipe2_id, "lunch", 1.0,
-                 datetime(2026, 2, 5, 12, 0), self.db_path)
+        log_meals(1, [
+            (self.recipe1_id, "breakfast", 1.0, datetime(2026, 2, 5, 8, 0)),
+            (self.recipe2_id, "lunch", 1.0, datetime(2026, 2, 5, 12, 0)),
+        ], self.db_path)
 
         summary = daily_summary(1, date(2026, 2, 5), db_path=self.db_path)
         self.assertEqual(summary.num_meals, 2)
@@ -70,12 +103,23 @@ class TestTracker(unittest.TestCase):
         summary = daily_summary(1, date(2026, 2, 10), db_path=self.db_path)
         self.assertEqual(summary.num_meals, 0)
 
+    def test_daily_summary_sees_new_logs(self):
+        day = date(2026, 2, 5)
+        self.assertEqual(daily_summary(1, day, db_path=self.db_path).num_meals, 0)
+
+        log_meal(1, self.recipe1_id, "breakfast", 1.0,
+                 datetime(2026, 2, 5, 8, 0), self.db_path)
+
+        summary = daily_summary(1, day, db_path=self.db_path)
+        self.assertEqual(summary.num_meals, 1)
+        self.assertAlmostEqual(summary.total_nutrition.calories, 300)
+
     def test_weekly_summary(self):
         # Log meals on Monday and Wednesday
-        log_meal(1, self.recipe1_id, "breakfast", 1.0,
-                 datetime(2026, 2, 2, 8, 0), self.db_path)  # Monday
-        log_meal(1, self.recipe2_id, "lunch", 1.0,
-                 datetime(2026, 2, 4, 12, 0), self.db_path)  # Wednesday
+        log_meals(1, [
+            (self.recipe1_id, "breakfast", 1.0, datetime(2026, 2, 2, 8, 0)),  # Monday
+            (self.recipe2_id, "lunch", 1.0, datetime(2026, 2, 4, 12, 0)),  # Wednesday
+        ], self.db_path)
 
         summary = weekly_summary(1, date(2026, 2, 2), db_path=self.db_path)
         self.assertEqual(summary.num_meals, 2)
@@ -103,6 +147,60 @@ class TestTracker(unittest.TestCase):
         self.assertAlmostEqual(summary.total_nutrition.calories, 600)  # 300 * 2
         self.assertAlmostEqual(summary.total_nutrition.protein_g, 40)  # 20 * 2
 
+    def test_weekly_summary_counts_meals_without_nutrition(self):
+        recipe3_id = save_recipe(Recipe(
+            id=None, title="Test Snack", source="test", meal_types=["lunch"],
+        ), self.db_path)
+        log_meal(1, self.recipe1_id, "breakfast", 1.0,
+                 datetime(2026, 2, 2, 8, 0), self.db_path)
+        log_meal(1, recipe3_id, "lunch", 1.0,
+                 datetime(2026, 2, 2, 12, 0), self.db_path)
+
+        summary = weekly_summary(1, date(2026, 2, 2), db_path=self.db_path)
+        self.assertEqual(summary.num_meals, 2)
+        self.assertEqual(summary.num_days, 1)
+        self.assertAlmostEqual(summary.total_nutrition.calories, 300)
+
+    def test_daily_summary_sees_other_connections(self):
+        day = date(2026, 2, 5)
+        self.assertEqual(daily_summary(1, day, db_path=self.db_path).num_meals, 0)
+
+        # A write that bypasses get_connection, as another process's would
+        self.keeper.execute(
+            """INSERT INTO meal_log (user_id, recipe_id, meal_type, servings, logged_at, calories)
+               VALUES (1, ?, 'breakfast', 1.0, '2026-02-05T08:00:00', 300)""",
+            (self.recipe1_id,),
+        )
+        self.keeper.commit()
+
+        self.assertEqual(daily_summary(1, day, db_path=self.db_path).num_meals, 1)
+
+    def test_log_keeps_nutrition_as_logged(self):
+        log_meal(1, self.recipe1_id, "breakfast", 1.0,
+                 datetime(2026, 2, 5, 8, 0), self.db_path)
+        with get_connection(self.db_path) as conn:
+            conn.execute("UPDATE recipe_nutrition SET calories = 999 WHERE recipe_id = ?",
+                         (self.recipe1_id,))
+
+        summary = daily_summary(1, date(2026, 2, 5), db_path=self.db_path)
+        self.assertAlmostEqual(summary.total_nutrition.calories, 300)
+
+    def test_init_db_backfills_rollups(self):
+        log_meal(1, self.recipe1_id, "breakfast", 2.0,
+                 datetime(2026, 2, 5, 8, 0), self.db_path)
+        log_meal(1, self.recipe2_id, "lunch", 1.0,
+                 datetime(2026, 2, 6, 12, 0), self.db_path)
+        # As in a database from before daily_rollups existed
+        with get_connection(self.db_path) as conn:
+            conn.execute("DROP TABLE daily_rollups")
+
+        init_db(self.db_path)
+
+        summary = monthly_summary(1, 2026, 2, db_path=self.db_path)
+        self.assertEqual(summary.num_meals, 2)
+        self.assertEqual(summary.num_days, 2)
+        self.assertAlmostEqual(summary.total_nutrition.calories, 1100)  # 600 + 500
+
 
 if __name__ == "__main__":
     unittest.main()